@@ -0,0 +1,196 @@
+"""
+Admission control and load shedding.
+
+Every request is assigned a route class (read, write or bulk). Each class has
+its own concurrency limit, a bounded wait queue and a queue deadline. When the
+queue is full, or a request waits past its deadline, it is rejected at once
+with 503 and Retry-After instead of piling up on the threadpool and SQLite's
+write lock. Requests that are admitted therefore keep a bounded latency.
+"""
+
+import asyncio
+import json
+import os
+from collections import deque
+from typing import Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+class RouteClassLimiter:
+    """Concurrency limit with a bounded FIFO queue for one route class."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, deadline: float, retry_after: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.deadline = deadline
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+
+    async def acquire(self) -> Optional[str]:
+        """Wait for a slot. Returns None when admitted, else the reason for shedding."""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return None
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed_queue_full += 1
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.deadline)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # The slot was handed over just as the deadline fired; keep it
+                self.admitted += 1
+                return None
+            self._waiters.remove(waiter)
+            self.shed_deadline += 1
+            return "deadline"
+        except asyncio.CancelledError:
+            # Client went away while queued; pass on a slot we may already own
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        self.admitted += 1
+        return None
+
+    def release(self):
+        """Free a slot, handing it straight to the oldest waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot moves to the waiter, so active stays the same
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "deadline_seconds": self.deadline,
+            "active": self.active,
+            "queue_depth": len(self._waiters),
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_deadline": self.shed_deadline,
+        }
+
+
+class AdmissionController:
+    """Holds the limiter for each route class and decides which one a request uses."""
+
+    # Paths that are never limited, so health checks work even under overload
+    EXEMPT_PATHS = ("/health",)
+
+    BULK_PREFIXES = ("/orders/bulk", "/orders/batch", "/items/bulk", "/admin/order-index")
+
+    def __init__(self):
+        self.enabled = os.getenv("ADMISSION_ENABLED", "1") != "0"
+        self.limiters = {
+            "read": RouteClassLimiter(
+                "read",
+                max_concurrent=_env_int("ADMISSION_READ_CONCURRENCY", 32),
+                max_queue=_env_int("ADMISSION_READ_QUEUE", 128),
+                deadline=_env_float("ADMISSION_READ_DEADLINE", 2.0),
+                retry_after=1,
+            ),
+            # SQLite has a single writer, so extra concurrent writers only wait on the lock
+            "write": RouteClassLimiter(
+                "write",
+                max_concurrent=_env_int("ADMISSION_WRITE_CONCURRENCY", 4),
+                max_queue=_env_int("ADMISSION_WRITE_QUEUE", 64),
+                deadline=_env_float("ADMISSION_WRITE_DEADLINE", 2.0),
+                retry_after=2,
+            ),
+            "bulk": RouteClassLimiter(
+                "bulk",
+                max_concurrent=_env_int("ADMISSION_BULK_CONCURRENCY", 1),
+                max_queue=_env_int("ADMISSION_BULK_QUEUE", 8),
+                deadline=_env_float("ADMISSION_BULK_DEADLINE", 5.0),
+                retry_after=5,
+            ),
+        }
+
+    def classify(self, method: str, path: str) -> Optional[str]:
+        """Return the route class for a request, or None if it is not limited."""
+        if method == "OPTIONS" or path.startswith(self.EXEMPT_PATHS):
+            return None
+        if path.startswith(self.BULK_PREFIXES):
+            return "bulk"
+        if method in ("GET", "HEAD"):
+            return "read"
+        return "write"
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "classes": {name: limiter.stats() for name, limiter in self.limiters.items()},
+        }
+
+
+admission = AdmissionController()
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the admission controller to HTTP requests."""
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.controller.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.controller.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiters[route_class]
+        rejected = await limiter.acquire()
+        if rejected:
+            await self._reject(send, limiter, rejected)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    @staticmethod
+    async def _reject(send, limiter: RouteClassLimiter, reason: str):
+        body = json.dumps({
+            "detail": "Server overloaded, retry later",
+            "route_class": limiter.name,
+            "reason": reason,
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(limiter.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,252 @@
+"""
+Hot/cold partitioning for orders.
+
+Old orders in a terminal state (refunded, or completed and paid) are moved out
+of the hot `orders` table into one SQLite file per order month under
+ARCHIVE_DIR. The `order_archives` catalog table in the main database records
+which months exist, so readers only ATTACH the files they need, one at a time.
+"""
+
+import heapq
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Optional, Tuple
+
+from app.database import DATABASE_PATH, get_connection
+
+ARCHIVE_DIR = os.getenv(
+    "ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(DATABASE_PATH)), "archive")
+)
+
+# Orders that can no longer change state are safe to move to cold storage
+TERMINAL_WHERE = "(status = 'refunded' OR (status = 'completed' AND payment_status = 'paid'))"
+
+ORDER_COLUMNS = (
+    "id, order_number, customer_name, customer_email, customer_avatar, order_date, "
+    "status, total_amount, payment_status, created_at, updated_at"
+)
+
+ARCHIVE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS archive.orders (
+        id TEXT PRIMARY KEY,
+        order_number TEXT NOT NULL UNIQUE,
+        customer_name TEXT NOT NULL,
+        customer_email TEXT NOT NULL,
+        customer_avatar TEXT,
+        order_date TEXT NOT NULL,
+        status TEXT NOT NULL CHECK(status IN ('pending', 'completed', 'refunded')),
+        total_amount REAL NOT NULL,
+        payment_status TEXT NOT NULL CHECK(payment_status IN ('paid', 'unpaid')),
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+"""
+
+BATCH_SCHEMA = "CREATE TEMP TABLE IF NOT EXISTS archive_batch (id TEXT PRIMARY KEY)"
+
+
+def archive_filename(period: str) -> str:
+    """File name for a YYYY-MM period."""
+    return f"orders-{period}.db"
+
+
+@contextmanager
+def attached(cursor, filename: str):
+    """ATTACH an archive file as schema `archive` for the duration of the block."""
+    cursor.execute("ATTACH DATABASE ? AS archive", (os.path.join(ARCHIVE_DIR, filename),))
+    try:
+        yield cursor
+    finally:
+        cursor.execute("DETACH DATABASE archive")
+
+
+def list_archives(cursor) -> list:
+    """Return catalog rows, newest period first."""
+    cursor.execute(
+        "SELECT period, filename, order_count, max_order_seq, updated_at "
+        "FROM order_archives ORDER BY period DESC"
+    )
+    return cursor.fetchall()
+
+
+def max_archived_order_seq(cursor) -> int:
+    """Highest order number sequence ever archived, or 0."""
+    cursor.execute("SELECT COALESCE(MAX(max_order_seq), 0) AS seq FROM order_archives")
+    return cursor.fetchone()["seq"]
+
+
+def find_archived_order(cursor, order_id: str):
+    """Look an order up in the archives, newest period first."""
+    for archive in list_archives(cursor):
+        with attached(cursor, archive["filename"]):
+            cursor.execute(f"SELECT {ORDER_COLUMNS} FROM archive.orders WHERE id = ?", (order_id,))
+            row = cursor.fetchone()
+        if row:
+            return row
+    return None
+
+
+def fetch_page_with_archives(
+    cursor, where: str, params: list, columns: str, order_by: str,
+    sort_key: Callable, descending: bool, limit: int, offset: int
+) -> Tuple[int, list]:
+    """
+    Fetch a page in `order_by` order across the hot table and all archives.
+
+    Each source returns its own top offset+limit rows, which are merged on
+    sort_key, so deep pages cost proportionally more. This is the opt-in
+    cold path.
+    """
+    where_clause = f"WHERE {where}" if where else ""
+    select = f"SELECT {columns} FROM {{schema}}.orders {where_clause} ORDER BY {order_by} LIMIT ?"
+    count = f"SELECT COUNT(*) AS count FROM {{schema}}.orders {where_clause}"
+
+    def read(schema: str):
+        cursor.execute(count.format(schema=schema), params)
+        source_total = cursor.fetchone()["count"]
+        cursor.execute(select.format(schema=schema), params + [offset + limit])
+        return source_total, cursor.fetchall()
+
+    total, rows = read("main")
+    sources = [rows]
+    for archive in list_archives(cursor):
+        with attached(cursor, archive["filename"]):
+            source_total, rows = read("archive")
+        total += source_total
+        sources.append(rows)
+
+    merged = heapq.merge(*sources, key=sort_key, reverse=descending)
+    return total, list(islice(merged, offset, offset + limit))
+
+
+def archive_orders(
+    cutoff: str,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+    progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Move terminal orders with order_date before `cutoff` (YYYY-MM-DD) into the archives.
+
+    Work is committed per batch, and every batch belongs to a single month, so
+    the hot table's write lock is only held briefly and an interrupted run can simply be restarted. Rows are
+    copied with INSERT OR REPLACE and committed before they are deleted, so
+    retrying a batch is idempotent.
+    """
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    conn = get_connection()
+    cursor = conn.cursor()
+    summary = {"archived": 0, "batches": 0, "periods": set()}
+
+    try:
+        # Batch ids go through a temp table rather than bound IN (...) lists, so
+        # batch_size is not limited by SQLite's bound-parameter limit
+        cursor.execute(BATCH_SCHEMA)
+        # Work one month at a time so each batch attaches a single archive file
+        cursor.execute(
+            f"SELECT DISTINCT substr(order_date, 1, 7) AS period FROM orders "
+            f"WHERE order_date < ? AND {TERMINAL_WHERE} ORDER BY period",
+            (cutoff,)
+        )
+        periods = [row["period"] for row in cursor.fetchall()]
+
+        for period in periods:
+            period_start = f"{period}-01"
+            period_end = min(cutoff, _next_period_start(period))
+            while max_batches is None or summary["batches"] < max_batches:
+                cursor.execute("DELETE FROM temp.archive_batch")
+                cursor.execute(
+                    f"INSERT INTO temp.archive_batch (id) SELECT id FROM orders "
+                    f"WHERE order_date >= ? AND order_date < ? AND {TERMINAL_WHERE} LIMIT ?",
+                    (period_start, period_end, batch_size)
+                )
+                batch_count = cursor.rowcount
+                # ATTACH is not allowed inside the transaction the INSERT opened
+                conn.commit()
+                if not batch_count:
+                    break
+
+                moved = _move_period(conn, cursor, period, batch_count)
+                summary["periods"].add(period)
+                summary["archived"] += moved
+                summary["batches"] += 1
+                if progress:
+                    progress(summary)
+    finally:
+        conn.close()
+
+    summary["periods"] = sorted(summary["periods"])
+    return summary
+
+
+def _next_period_start(period: str) -> str:
+    """First day of the month after a YYYY-MM period."""
+    year, month = (int(part) for part in period.split("-"))
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year:04d}-{month:02d}-01"
+
+
+def _move_period(conn, cursor, period: str, batch_count: int) -> int:
+    """
+    Copy one month's batch (the ids in temp.archive_batch) into its archive
+    file, then delete it from the hot table.
+
+    In WAL mode a transaction spanning ATTACHed files is not atomic, so a
+    crash could keep the delete and lose the copy. The copy is therefore
+    committed first, and the delete runs as a second transaction that only
+    removes rows whose archived copy is identical. A crash in between leaves
+    the order in both places, and the next run copies it again.
+    Returns the number of orders moved.
+    """
+    filename = archive_filename(period)
+    batch = "(SELECT id FROM temp.archive_batch)"
+
+    with attached(cursor, filename):
+        cursor.execute(ARCHIVE_SCHEMA)
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                f"SELECT COALESCE(MAX(CAST(substr(order_number, 5) AS INTEGER)), 0) AS seq "
+                f"FROM main.orders WHERE id IN {batch}"
+            )
+            max_seq = cursor.fetchone()["seq"]
+            cursor.execute(
+                f"INSERT OR REPLACE INTO archive.orders ({ORDER_COLUMNS}) "
+                f"SELECT {ORDER_COLUMNS} FROM main.orders WHERE id IN {batch}"
+            )
+            _upsert_catalog(cursor, period, filename, max_seq)
+            conn.commit()
+
+            cursor.execute("BEGIN IMMEDIATE")
+            # Orders updated since the copy keep their hot row; their stale copies are dropped
+            cursor.execute(
+                f"DELETE FROM main.orders WHERE id IN {batch} AND updated_at = "
+                f"(SELECT a.updated_at FROM archive.orders AS a WHERE a.id = main.orders.id)"
+            )
+            moved = cursor.rowcount
+            if moved < batch_count:
+                cursor.execute(
+                    f"DELETE FROM archive.orders WHERE id IN {batch} "
+                    f"AND id IN (SELECT id FROM main.orders)"
+                )
+                _upsert_catalog(cursor, period, filename, 0)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return moved
+
+
+def _upsert_catalog(cursor, period: str, filename: str, max_seq: int):
+    """Record an archive file's current order count in the catalog."""
+    cursor.execute("""
+        INSERT INTO main.order_archives (period, filename, order_count, max_order_seq, updated_at)
+        VALUES (?, ?, (SELECT COUNT(*) FROM archive.orders), ?, ?)
+        ON CONFLICT(period) DO UPDATE SET
+            order_count = excluded.order_count,
+            max_order_seq = MAX(max_order_seq, excluded.max_order_seq),
+            updated_at = excluded.updated_at
+    """, (period, filename, max_seq, datetime.utcnow().isoformat()))
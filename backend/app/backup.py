@@ -0,0 +1,248 @@
+"""
+Online backups through the SQLite backup API.
+
+A backup copies the live database a few pages at a time with
+`sqlite3.Connection.backup` and pauses between steps, which caps its I/O so
+API writers keep their latency.
+
+In WAL mode (migration 007) the source connection holds one read
+transaction for the whole run. Every step then copies from the same snapshot:
+the result is consistent, and writers are never blocked by it. The WAL file
+cannot be checkpointed past that snapshot until the backup ends.
+
+In rollback-journal mode each step takes its own short read lock, and SQLite
+restarts the copy whenever another connection commits in between. After
+MAX_RESTARTS restarts the backup fails rather than running forever.
+
+With compress=True the finished copy is gzip-compressed in chunks, and only
+the .db.gz file is kept.
+"""
+
+import gzip
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from app.database import DATABASE_PATH
+
+BACKUP_DIR = os.getenv(
+    "BACKUP_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(DATABASE_PATH)), "backups")
+)
+
+# Pages copied per step (4 MB with the default 4 KB page size)
+PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "1024"))
+
+# Pause after each step, which caps the backup's share of disk bandwidth
+STEP_PAUSE = float(os.getenv("BACKUP_STEP_PAUSE", "0.02"))
+
+MAX_RESTARTS = int(os.getenv("BACKUP_MAX_RESTARTS", "20"))
+
+COMPRESS_CHUNK_SIZE = 1024 * 1024
+
+
+class BackupCancelled(Exception):
+    """Raised from the progress callback to abort a running backup."""
+
+
+class Backup:
+    """Progress of one backup run."""
+
+    def __init__(self, path: str, pages_per_step: int, pause: float, compress: bool):
+        self.id = str(uuid.uuid4())
+        self.path = path
+        self.pages_per_step = pages_per_step
+        self.pause = pause
+        self.compress = compress
+        self.status = "queued"
+        self.journal_mode: Optional[str] = None
+        self.page_size = 0
+        self.pages_total = 0
+        self.pages_done = 0
+        self.steps = 0
+        self.restarts = 0
+        self.output_bytes = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.copied_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+
+    def to_dict(self) -> dict:
+        now = self.finished_at or time.time()
+        elapsed = now - self.started_at if self.started_at else 0.0
+        copy_elapsed = (self.copied_at or now) - self.started_at if self.started_at else 0.0
+        copied_bytes = self.pages_done * self.page_size
+        return {
+            "id": self.id,
+            "status": self.status,
+            "path": self.path,
+            "compress": self.compress,
+            "journal_mode": self.journal_mode,
+            "pages_per_step": self.pages_per_step,
+            "pause_seconds": self.pause,
+            "page_size": self.page_size,
+            "pages_total": self.pages_total,
+            "pages_done": self.pages_done,
+            "progress": self.pages_done / self.pages_total if self.pages_total else 0.0,
+            "steps": self.steps,
+            "restarts": self.restarts,
+            "copied_mb": round(copied_bytes / 2**20, 1),
+            "mb_per_second": round(copied_bytes / 2**20 / copy_elapsed, 1) if copy_elapsed else 0.0,
+            "output_bytes": self.output_bytes,
+            "elapsed_seconds": round(elapsed, 2),
+            "started_at": datetime.utcfromtimestamp(self.started_at).isoformat() if self.started_at else None,
+            "error": self.error,
+        }
+
+
+def default_path(compress: bool = False) -> str:
+    """Timestamped file name in BACKUP_DIR."""
+    name = f"app-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.db"
+    return os.path.join(BACKUP_DIR, name + (".gz" if compress else ""))
+
+
+def run_backup(backup: Backup, progress: Optional[Callable[[Backup], None]] = None) -> Backup:
+    """Copy the live database into backup.path, updating `backup` as it goes."""
+    partial = (backup.path[:-3] if backup.compress else backup.path) + ".partial"
+    backup.status = "running"
+    backup.started_at = time.time()
+
+    source = target = None
+    try:
+        # Inside the try, so a bad BACKUP_DIR or a full disk fails this backup instead of leaving it running
+        os.makedirs(os.path.dirname(os.path.abspath(backup.path)), exist_ok=True)
+        source = sqlite3.connect(DATABASE_PATH)
+        target = sqlite3.connect(partial)
+        backup.journal_mode = source.execute("PRAGMA journal_mode").fetchone()[0]
+        backup.page_size = source.execute("PRAGMA page_size").fetchone()[0]
+        if backup.journal_mode == "wal":
+            # Pin one snapshot for every step; WAL readers do not block writers
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+        last_remaining = None
+
+        def on_step(status, remaining, total):
+            nonlocal last_remaining
+            if last_remaining is not None and remaining > last_remaining:
+                # Another connection committed between steps, so SQLite started over
+                backup.restarts += 1
+                if backup.restarts > MAX_RESTARTS:
+                    raise RuntimeError(
+                        f"Backup restarted {backup.restarts} times under concurrent writes; "
+                        "enable WAL mode (migration 007)"
+                    )
+            last_remaining = remaining
+            backup.steps += 1
+            backup.pages_total = total
+            backup.pages_done = total - remaining
+            if progress:
+                progress(backup)
+            if backup.cancel_requested:
+                raise BackupCancelled()
+            if remaining:
+                time.sleep(backup.pause)
+
+        source.backup(target, pages=backup.pages_per_step, progress=on_step)
+        backup.copied_at = time.time()
+    except BackupCancelled:
+        backup.status = "cancelled"
+    except Exception as e:
+        backup.status = "failed"
+        backup.error = str(e)
+    finally:
+        if source is not None:
+            if source.in_transaction:
+                source.rollback()
+            source.close()
+        if target is not None:
+            target.close()
+
+    if backup.status != "running":
+        backup.finished_at = time.time()
+        if os.path.exists(partial):
+            os.remove(partial)
+        return backup
+
+    try:
+        if backup.compress:
+            backup.status = "compressing"
+            # Streamed in fixed-size chunks, so memory use does not grow with the database
+            with open(partial, "rb") as src, gzip.open(backup.path, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, COMPRESS_CHUNK_SIZE)
+            os.remove(partial)
+        else:
+            os.replace(partial, backup.path)
+    except OSError as e:
+        backup.status = "failed"
+        backup.error = str(e)
+        backup.finished_at = time.time()
+        return backup
+
+    backup.output_bytes = os.path.getsize(backup.path)
+    backup.status = "completed"
+    backup.finished_at = time.time()
+    if progress:
+        progress(backup)
+    return backup
+
+
+# Backups started through the API, kept per process for progress queries
+_backups: Dict[str, Backup] = {}
+_lock = threading.Lock()
+
+
+def start_backup(
+    path: Optional[str] = None,
+    pages_per_step: int = PAGES_PER_STEP,
+    pause: float = STEP_PAUSE,
+    compress: bool = False
+) -> Optional[Backup]:
+    """Run a backup on a background thread. Returns None if one is already running."""
+    with _lock:
+        if any(backup.status in ("queued", "running", "compressing") for backup in _backups.values()):
+            return None
+        backup = Backup(path or default_path(compress), pages_per_step, pause, compress)
+        _backups[backup.id] = backup
+
+    threading.Thread(target=run_backup, args=(backup,), name="db-backup", daemon=True).start()
+    return backup
+
+
+def get_backup(backup_id: str) -> Optional[Backup]:
+    return _backups.get(backup_id)
+
+
+def cancel_backup(backup_id: str) -> Optional[Backup]:
+    """Ask a running backup to stop after its current step."""
+    backup = _backups.get(backup_id)
+    if backup:
+        backup.cancel_requested = True
+    return backup
+
+
+def list_backup_runs() -> List[dict]:
+    """Backups started by this process, newest first."""
+    return [backup.to_dict() for backup in sorted(_backups.values(), key=lambda b: b.started_at or 0, reverse=True)]
+
+
+def list_backup_files() -> List[dict]:
+    """Completed backup files in BACKUP_DIR, newest first."""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    files = []
+    for name in os.listdir(BACKUP_DIR):
+        if name.endswith((".db", ".db.gz")):
+            stat = os.stat(os.path.join(BACKUP_DIR, name))
+            files.append({
+                "filename": name,
+                "bytes": stat.st_size,
+                "modified_at": datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+            })
+    return sorted(files, key=lambda f: f["modified_at"], reverse=True)
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used cache.
+
+    Handlers run in FastAPI's threadpool, so every access takes a lock.
+    The cache lives in-process: each uvicorn worker keeps its own copy.
+
+    Readers take a token() before querying the database and pass it to set();
+    the value is dropped if any invalidation happened in between, so a read
+    that raced a committed write can never re-cache the stale row.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None on a miss."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def token(self) -> int:
+        """Return the current invalidation generation, for a later set()."""
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            if token is not None and token != self._generation:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given keys if present."""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
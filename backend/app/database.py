@@ -1,10 +1,13 @@
 import os
 import sqlite3
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, List, Sequence
 
 DATABASE_PATH = os.getenv("DATABASE_PATH", "app.db")
 
+# Values per IN (...) query, kept below SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
 
 def get_connection() -> sqlite3.Connection:
     """Create a new database connection."""
@@ -13,6 +16,20 @@ def get_connection() -> sqlite3.Connection:
     return conn
 
 
+def fetch_in_chunks(cursor, sql: str, values: Sequence) -> List[sqlite3.Row]:
+    """
+    Run a query with an `IN ({placeholders})` slot over many values, one chunk at a time.
+    Duplicate values are dropped; rows from all chunks are returned together.
+    """
+    unique_values = list(dict.fromkeys(values))
+    rows = []
+    for start in range(0, len(unique_values), IN_CHUNK_SIZE):
+        chunk = unique_values[start:start + IN_CHUNK_SIZE]
+        cursor.execute(sql.format(placeholders=", ".join("?" * len(chunk))), chunk)
+        rows.extend(cursor.fetchall())
+    return rows
+
+
 @contextmanager
 def get_db() -> Generator[sqlite3.Cursor, None, None]:
     """Context manager for database connections that yields a cursor."""
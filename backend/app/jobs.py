@@ -0,0 +1,262 @@
+"""
+Background execution of very large bulk operations.
+
+A job stores its ids in `bulk_job_items` and its progress in `bulk_jobs`.
+A worker thread works through the ids in small chunks. Each chunk is
+processed, and its results and the job's progress are written, in the same
+short transaction. So other writers can get the SQLite write lock between
+chunks, and a restarted process carries on exactly where the last committed
+chunk left off.
+
+Handlers are registered by kind (see `register_handler`). A handler takes a
+cursor, a list of order ids and the job params, and returns one JSON-able
+result per id (None when there was nothing to do for that id). Listeners
+added with `on_chunk_committed` are called after each chunk commits.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from app.database import get_db
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = int(os.getenv("JOBS_CHUNK_SIZE", "500"))
+
+# Pause between chunks. SQLite's busy handler retries at intervals of up to
+# 100 ms, so a shorter pause lets the worker take the lock back before a
+# waiting writer wakes up, and starves it.
+CHUNK_PAUSE = float(os.getenv("JOBS_CHUNK_PAUSE", "0.05"))
+
+POLL_INTERVAL = 1.0
+
+# Longest wait after repeated worker errors; the wait doubles from POLL_INTERVAL
+MAX_BACKOFF = 30.0
+
+ACTIVE_STATUSES = ("queued", "running")
+
+Handler = Callable[[object, List[str], dict], List[Optional[dict]]]
+CommitListener = Callable[[str, List[str], List[Optional[dict]]], None]
+
+_handlers: Dict[str, Handler] = {}
+_commit_listeners: List[CommitListener] = []
+
+
+def register_handler(kind: str, handler: Handler):
+    """Register the function that processes one chunk of a job kind."""
+    _handlers[kind] = handler
+
+
+def on_chunk_committed(listener: CommitListener):
+    """Call listener(kind, order_ids, results) after every committed chunk."""
+    _commit_listeners.append(listener)
+
+
+def create_job(kind: str, order_ids: List[str], params: Optional[dict] = None) -> dict:
+    """Persist a new job with its ids and wake the worker."""
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    job_id = str(uuid.uuid4())
+    now = datetime.utcnow().isoformat()
+    with get_db() as cursor:
+        cursor.execute("""
+            INSERT INTO bulk_jobs (id, kind, status, params, total, processed, succeeded, cancel_requested, created_at, updated_at)
+            VALUES (?, ?, 'queued', ?, ?, 0, 0, 0, ?, ?)
+        """, (job_id, kind, json.dumps(params or {}), len(order_ids), now, now))
+        cursor.executemany(
+            "INSERT INTO bulk_job_items (job_id, seq, order_id) VALUES (?, ?, ?)",
+            ((job_id, seq, order_id) for seq, order_id in enumerate(order_ids, start=1))
+        )
+
+    worker.wake()
+    return {"job_id": job_id, "kind": kind, "status": "queued", "total": len(order_ids)}
+
+
+def get_job(job_id: str, results_offset: int = 0, results_limit: int = 100) -> Optional[dict]:
+    """Return a job's progress plus a page of the per-item results recorded so far."""
+    with get_db() as cursor:
+        cursor.execute("SELECT * FROM bulk_jobs WHERE id = ?", (job_id,))
+        job = cursor.fetchone()
+        if not job:
+            return None
+
+        cursor.execute("""
+            SELECT order_id, result FROM bulk_job_items
+            WHERE job_id = ? AND seq <= ?
+            ORDER BY seq LIMIT ? OFFSET ?
+        """, (job_id, job["processed"], results_limit, results_offset))
+        results = [
+            {"order_id": row["order_id"], "result": json.loads(row["result"]) if row["result"] else None}
+            for row in cursor.fetchall()
+        ]
+
+        return {
+            "id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "params": json.loads(job["params"]),
+            "total": job["total"],
+            "processed": job["processed"],
+            "succeeded": job["succeeded"],
+            "progress": job["processed"] / job["total"] if job["total"] else 1.0,
+            "cancel_requested": bool(job["cancel_requested"]),
+            "error": job["error"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+            "results_offset": results_offset,
+            "results": results
+        }
+
+
+def cancel_job(job_id: str) -> Optional[str]:
+    """Request cancellation. Returns the job status, or None if it does not exist."""
+    with get_db() as cursor:
+        cursor.execute(
+            "UPDATE bulk_jobs SET cancel_requested = 1, updated_at = ? WHERE id = ?",
+            (datetime.utcnow().isoformat(), job_id)
+        )
+        if cursor.rowcount == 0:
+            return None
+        # Jobs no worker has picked up yet are cancelled on the spot
+        cursor.execute(
+            "UPDATE bulk_jobs SET status = 'cancelled' WHERE id = ? AND status = 'queued'",
+            (job_id,)
+        )
+        cursor.execute("SELECT status FROM bulk_jobs WHERE id = ?", (job_id,))
+        return cursor.fetchone()["status"]
+
+
+def run_next_chunk(job_id: str) -> bool:
+    """
+    Process the next chunk of a job in one transaction.
+
+    Returns False once the job has finished, been cancelled or failed.
+    Progress is re-read under the write lock, so several workers (e.g. one
+    per uvicorn process) never process the same chunk twice.
+    """
+    now = datetime.utcnow().isoformat()
+    with get_db() as cursor:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("SELECT * FROM bulk_jobs WHERE id = ?", (job_id,))
+        job = cursor.fetchone()
+        if not job or job["status"] not in ACTIVE_STATUSES:
+            return False
+
+        if job["cancel_requested"]:
+            cursor.execute("UPDATE bulk_jobs SET status = 'cancelled', updated_at = ? WHERE id = ?", (now, job_id))
+            return False
+
+        cursor.execute("""
+            SELECT seq, order_id FROM bulk_job_items
+            WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?
+        """, (job_id, job["processed"], CHUNK_SIZE))
+        items = cursor.fetchall()
+        if not items:
+            cursor.execute("UPDATE bulk_jobs SET status = 'completed', updated_at = ? WHERE id = ?", (now, job_id))
+            return False
+
+        order_ids = [item["order_id"] for item in items]
+        results = _handlers[job["kind"]](cursor, order_ids, json.loads(job["params"]))
+
+        cursor.executemany(
+            "UPDATE bulk_job_items SET result = ? WHERE job_id = ? AND seq = ?",
+            [
+                (json.dumps(result) if result is not None else None, job_id, item["seq"])
+                for item, result in zip(items, results)
+            ]
+        )
+        cursor.execute("""
+            UPDATE bulk_jobs
+            SET status = 'running', processed = processed + ?, succeeded = succeeded + ?, updated_at = ?
+            WHERE id = ?
+        """, (len(items), sum(1 for result in results if result is not None), now, job_id))
+
+    for listener in _commit_listeners:
+        try:
+            listener(job["kind"], order_ids, results)
+        except Exception:
+            logger.exception("Chunk commit listener failed for job %s", job_id)
+    return True
+
+
+def _fail_job(job_id: str, error: str):
+    with get_db() as cursor:
+        cursor.execute(
+            "UPDATE bulk_jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+            (error, datetime.utcnow().isoformat(), job_id)
+        )
+
+
+def _next_job_id() -> Optional[str]:
+    with get_db() as cursor:
+        cursor.execute(
+            "SELECT id FROM bulk_jobs WHERE status IN ('queued', 'running') ORDER BY created_at LIMIT 1"
+        )
+        row = cursor.fetchone()
+        return row["id"] if row else None
+
+
+class JobWorker:
+    """Single background thread draining queued and interrupted jobs, oldest first."""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bulk-job-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                job_id = _next_job_id()
+            except Exception:
+                logger.exception("Could not poll bulk_jobs")
+                job_id = None
+
+            if job_id is None:
+                self._wake.wait(POLL_INTERVAL)
+                self._wake.clear()
+                continue
+
+            try:
+                while not self._stop.is_set() and run_next_chunk(job_id):
+                    self._stop.wait(CHUNK_PAUSE)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                # Lock contention is transient; the chunk rolled back and is retried
+                if not (isinstance(e, sqlite3.OperationalError) and "locked" in str(e)):
+                    logger.exception("Bulk job %s failed", job_id)
+                    try:
+                        _fail_job(job_id, str(e))
+                    except Exception:
+                        # The job stays active and is picked up again after the backoff
+                        logger.exception("Could not mark bulk job %s as failed", job_id)
+                # Back off so a locked or broken database does not spin the worker
+                self._stop.wait(min(POLL_INTERVAL * 2 ** (failures - 1), MAX_BACKOFF))
+
+
+worker = JobWorker()
@@ -1,10 +1,19 @@
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routes import health_router, items_router, orders_router
+from app.admission import AdmissionMiddleware
+from app.jobs import worker as job_worker
+from app.order_index import order_index
+from app.routes import backups_router, health_router, items_router, order_index_router, orders_router
 
 app = FastAPI(title="Orders Management API", version="1.0.0")
 
+# Shed load per route class before requests queue on the threadpool.
+# Added first so CORS wraps it and 503 responses still carry CORS headers.
+app.add_middleware(AdmissionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -18,6 +27,28 @@ app.add_middleware(
 app.include_router(health_router)
 app.include_router(items_router)
 app.include_router(orders_router)
+app.include_router(backups_router)
+app.include_router(order_index_router)
+
+
+@app.on_event("startup")
+def start_job_worker():
+    """Resume interrupted bulk jobs and process new ones in the background."""
+    if os.getenv("JOBS_WORKER_ENABLED", "1") != "0":
+        job_worker.start()
+
+
+@app.on_event("startup")
+def load_order_index():
+    """Load the in-memory order index when ORDER_INDEX_ENABLED=1."""
+    if order_index.enabled:
+        order_index.load()
+
+
+@app.on_event("shutdown")
+def stop_job_worker():
+    """Let the worker finish its current chunk before exiting."""
+    job_worker.stop()
 
 
 if __name__ == "__main__":
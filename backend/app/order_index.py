@@ -0,0 +1,363 @@
+"""
+Optional in-memory order engine.
+
+When ORDER_INDEX_ENABLED=1 the whole hot `orders` table is loaded at startup
+into compact `__slots__` records. Each filter tab keeps its own list of
+records, sorted by order_number, and live counters back the stats cards. The
+default list pages (any tab, order_number sort, page or keyset `after`),
+single lookups and stats are then answered without touching SQLite.
+
+SQLite stays the source of truth. Write paths commit first and then call
+refresh() with the ids they touched. refresh() re-reads those rows under the
+index lock, so the latest committed state always wins, whatever order
+concurrent writers finish in.
+
+load() builds new containers outside the lock and swaps them in, so the old
+index keeps serving reads while a reload scans the table. Ids refreshed
+during the scan are recorded and re-read after the swap.
+
+If a refresh fails after its write has committed, the index is marked not
+loaded and needs_reload is set, so reads fall back to SQLite until reload().
+
+The index lives in-process. It only sees writes made by this process, so run
+it with a single uvicorn worker, and reload() it (or restart) after archiving
+or editing the database from outside. check() compares it against SQLite.
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+
+from app.database import fetch_in_chunks, get_db
+
+logger = logging.getLogger(__name__)
+
+FIELDS = (
+    "id", "order_number", "customer_name", "customer_email", "customer_avatar", "order_date",
+    "status", "total_amount", "payment_status", "created_at", "updated_at",
+)
+
+# Python mirror of the SQL filters in routes.orders.STATUS_FILTERS; check() verifies they agree
+TAB_PREDICATES = {
+    "incomplete": lambda r: r.status == "pending" and r.payment_status == "unpaid",
+    "overdue": lambda r: r.status == "pending",
+    "ongoing": lambda r: r.status in ("pending", "completed") and r.payment_status == "unpaid",
+    "finished": lambda r: r.status == "completed" and r.payment_status == "paid",
+}
+
+_sort_key = attrgetter("order_number")
+
+# Tab membership only depends on (status, payment_status), so it is computed once per pair
+_tab_sets: Dict[Tuple[str, str], tuple] = {}
+
+
+def _tabs_for(record) -> tuple:
+    key = (record.status, record.payment_status)
+    tabs = _tab_sets.get(key)
+    if tabs is None:
+        tabs = _tab_sets[key] = ("all",) + tuple(tab for tab, matches in TAB_PREDICATES.items() if matches(record))
+    return tabs
+
+
+def _count_into(counts: dict, record, delta: int):
+    counts["total"] += delta
+    if record.status in counts:
+        counts[record.status] += delta
+    for tab in record.tabs[1:]:
+        counts[tab] += delta
+
+
+class OrderRecord:
+    """One order row. Supports row["column"] so the row helpers in routes.orders accept it."""
+
+    __slots__ = FIELDS + ("tabs",)
+
+    def __init__(self, row):
+        # row holds the columns in FIELDS order
+        (self.id, self.order_number, self.customer_name, self.customer_email, self.customer_avatar,
+         order_date, status, self.total_amount, payment_status, self.created_at, self.updated_at) = row
+        # Low-cardinality values share one string object across all records
+        self.status = sys.intern(status)
+        self.payment_status = sys.intern(payment_status)
+        self.order_date = sys.intern(order_date)
+        self.tabs = _tabs_for(self)
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def as_tuple(self) -> tuple:
+        return tuple(getattr(self, field) for field in FIELDS)
+
+
+class OrderIndex:
+    """In-memory copy of the orders table with per-tab sorted lists and counters."""
+
+    def __init__(self):
+        self.enabled = os.getenv("ORDER_INDEX_ENABLED", "0") == "1"
+        self.loaded = False
+        self.needs_reload = False
+        self.load_seconds = 0.0
+        self.lock = threading.RLock()
+        # Serializes load() calls; held for the whole build, unlike self.lock
+        self._load_lock = threading.Lock()
+        # Ids refreshed while a load is scanning, or None when no load is running
+        self._pending: Optional[set] = None
+        self._by_id, self._tabs, self._counts = self._empty()
+
+    @staticmethod
+    def _empty() -> tuple:
+        by_id: Dict[str, OrderRecord] = {}
+        tabs: Dict[str, List[OrderRecord]] = {"all": [], **{tab: [] for tab in TAB_PREDICATES}}
+        counts = {"total": 0, "pending": 0, "completed": 0, "refunded": 0, **{tab: 0 for tab in TAB_PREDICATES}}
+        return by_id, tabs, counts
+
+    def load(self):
+        """(Re)build the index from the orders table, serving the old copy until the swap."""
+        with self._load_lock:
+            start = time.perf_counter()
+            with self.lock:
+                self._pending = set()
+            try:
+                # A million new objects would trigger many full GC passes over the growing heap
+                gc.disable()
+                try:
+                    containers = self._build()
+                finally:
+                    gc.enable()
+            except Exception:
+                with self.lock:
+                    self._pending = None
+                raise
+
+            with self.lock:
+                self._by_id, self._tabs, self._counts = containers
+                pending, self._pending = self._pending, None
+                self.loaded = True
+                self.needs_reload = False
+                # Writes that committed during the scan may be missing from it
+                if pending:
+                    self._apply(list(pending))
+                self.load_seconds = time.perf_counter() - start
+            # Move the long-lived records out of the collector's view for later passes too
+            gc.freeze()
+
+    reload = load
+
+    def _build(self) -> tuple:
+        """Return new (by_id, tabs, counts) containers filled from a scan of the orders table."""
+        by_id, tabs, counts = self._empty()
+        with get_db() as cursor:
+            # A plain table scan plus one sort beats walking the order_number index
+            cursor.execute(f"SELECT {', '.join(FIELDS)} FROM orders")
+            while True:
+                rows = cursor.fetchmany(10_000)
+                if not rows:
+                    break
+                for row in rows:
+                    record = OrderRecord(row)
+                    by_id[record.id] = record
+                    for tab in record.tabs:
+                        tabs[tab].append(record)
+                    _count_into(counts, record, 1)
+        for records in tabs.values():
+            records.sort(key=_sort_key)
+        return by_id, tabs, counts
+
+    def _count(self, record: OrderRecord, delta: int):
+        _count_into(self._counts, record, delta)
+
+    def _add(self, record: OrderRecord):
+        self._by_id[record.id] = record
+        for tab in record.tabs:
+            insort(self._tabs[tab], record, key=_sort_key)
+        self._count(record, 1)
+
+    def _remove(self, order_id: str):
+        record = self._by_id.pop(order_id, None)
+        if record is None:
+            return
+        for tab in record.tabs:
+            records = self._tabs[tab]
+            i = bisect_left(records, record.order_number, key=_sort_key)
+            if i < len(records) and records[i] is record:
+                del records[i]
+        self._count(record, -1)
+
+    def refresh(self, order_ids: List[str]):
+        """Re-read committed rows for these ids and apply them; missing rows are removed."""
+        if not order_ids or not (self.loaded or self._pending is not None):
+            return
+        unique_ids = list(dict.fromkeys(order_ids))
+        with self.lock:
+            if self._pending is not None:
+                self._pending.update(unique_ids)
+            if self.loaded:
+                self._apply(unique_ids)
+
+    def _apply(self, unique_ids: List[str]):
+        """Re-read and apply rows under the lock; on failure, stop serving from memory."""
+        with self.lock:
+            try:
+                with get_db() as cursor:
+                    rows = {
+                        row["id"]: row
+                        for row in fetch_in_chunks(
+                            cursor, f"SELECT {', '.join(FIELDS)} FROM orders WHERE id IN ({{placeholders}})", unique_ids
+                        )
+                    }
+                for order_id in unique_ids:
+                    self._remove(order_id)
+                    if order_id in rows:
+                        self._add(OrderRecord(rows[order_id]))
+            except Exception:
+                # The write has committed, so do not fail the request; stop serving the stale copy instead
+                logger.exception("Order index refresh failed for %d orders; serving reads from SQLite", len(unique_ids))
+                self.loaded = False
+                self.needs_reload = True
+
+    def serves(self, spec) -> bool:
+        """Whether a list spec (routes.orders.OrderListSpec) can be answered from memory."""
+        return (
+            self.loaded
+            and spec.sort_by == "order_number"
+            and spec.date_from is None and spec.date_to is None
+            and spec.min_amount is None and spec.max_amount is None
+            and not spec.include_archived
+        )
+
+    def get(self, order_id: str) -> Optional[OrderRecord]:
+        return self._by_id.get(order_id)
+
+    def counts(self) -> dict:
+        """Same keys as routes.orders.fetch_order_counts."""
+        with self.lock:
+            return dict(self._counts)
+
+    def page(
+        self, status: str, descending: bool, offset: int, limit: int, after: Optional[str] = None
+    ) -> Tuple[int, List[OrderRecord]]:
+        """Return (total, records) for one page of a tab in order_number order."""
+        with self.lock:
+            records = self._tabs.get(status, self._tabs["all"])
+            total = len(records)
+            if descending:
+                end = bisect_left(records, after, key=_sort_key) if after is not None else total - offset
+                start = max(0, end - limit)
+                page = records[start:max(0, end)][::-1]
+            else:
+                start = bisect_right(records, after, key=_sort_key) if after is not None else offset
+                page = records[start:start + limit]
+            return total, page
+
+    def check(self, tab_filters: Dict[str, str]) -> dict:
+        """
+        Compare the index with the orders table and return a report of differences.
+
+        `tab_filters` are the SQL WHERE clauses per tab; counting them in SQL
+        also catches drift between them and TAB_PREDICATES.
+
+        The lock is held only while the containers are copied and an SQLite
+        read snapshot is pinned (WAL), so reads and refreshes are not blocked
+        during the scan. Records are never mutated in place, so shallow
+        copies are enough.
+        """
+        mismatched, missing = [], []
+        seen = 0
+        with get_db() as cursor:
+            with self.lock:
+                cursor.execute("BEGIN")
+                cursor.execute("SELECT 1 FROM orders LIMIT 1").fetchall()
+                by_id = dict(self._by_id)
+                tabs = {tab: list(records) for tab, records in self._tabs.items()}
+                counts = dict(self._counts)
+
+            cursor.execute(f"SELECT {', '.join(FIELDS)} FROM orders")
+            while True:
+                rows = cursor.fetchmany(10_000)
+                if not rows:
+                    break
+                for row in rows:
+                    seen += 1
+                    record = by_id.get(row["id"])
+                    if record is None:
+                        missing.append(row["id"])
+                    elif record.as_tuple() != tuple(row):
+                        mismatched.append(row["id"])
+
+            sql_counts = {}
+            for tab, where in tab_filters.items():
+                where_sql = f" WHERE {where}" if where else ""
+                cursor.execute(f"SELECT COUNT(*) AS count FROM orders{where_sql}")
+                sql_counts[tab] = cursor.fetchone()["count"]
+
+        extra = len(by_id) - (seen - len(missing))
+        tab_errors = {}
+        for tab, records in tabs.items():
+            counter = counts["total"] if tab == "all" else counts[tab]
+            ordered = all(a.order_number < b.order_number for a, b in zip(records, records[1:]))
+            if not (len(records) == counter == sql_counts.get(tab, counter)) or not ordered:
+                tab_errors[tab] = {"list": len(records), "counter": counter, "sql": sql_counts.get(tab), "sorted": ordered}
+
+        return {
+            "consistent": not (mismatched or missing or extra or tab_errors),
+            "orders_checked": seen,
+            "missing": missing[:100],
+            "mismatched": mismatched[:100],
+            "extra": extra,
+            "tabs": tab_errors,
+        }
+
+    def memory_report(self, sample_size: int = 1000) -> dict:
+        """
+        Estimate memory use from a sample of records, extrapolated per million orders.
+
+        Counts each record, its non-shared strings and floats, its share of
+        the id dict and its pointers in the tab lists.
+        """
+        with self.lock:
+            count = len(self._by_id)
+            if not count:
+                return {"orders": 0, "bytes_per_order": 0, "mb_per_million_orders": 0.0}
+            step = max(1, count // sample_size)
+            sample = list(self._by_id.values())[::step][:sample_size]
+            shared = {id(record.status) for record in sample} | {id(record.payment_status) for record in sample}
+            shared |= {id(record.order_date) for record in sample}
+
+            record_bytes = 0
+            for record in sample:
+                record_bytes += sys.getsizeof(record)
+                for field in FIELDS:
+                    value = getattr(record, field)
+                    if value is not None and id(value) not in shared:
+                        record_bytes += sys.getsizeof(value)
+            per_order = record_bytes / len(sample)
+
+            # Container overhead: the id dict and 8-byte pointers in each tab list
+            containers = sys.getsizeof(self._by_id) + sum(sys.getsizeof(records) for records in self._tabs.values())
+            per_order += containers / count
+
+        return {
+            "orders": count,
+            "bytes_per_order": round(per_order),
+            "estimated_mb": round(per_order * count / 2**20, 1),
+            "mb_per_million_orders": round(per_order * 1_000_000 / 2**20, 1),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "loaded": self.loaded,
+            "needs_reload": self.needs_reload,
+            "orders": len(self._by_id),
+            "load_seconds": round(self.load_seconds, 3),
+            "tabs": {tab: len(records) for tab, records in self._tabs.items()},
+        }
+
+
+order_index = OrderIndex()
@@ -1,5 +1,7 @@
+from app.routes.backups import router as backups_router
 from app.routes.health import router as health_router
 from app.routes.items import router as items_router
+from app.routes.order_index import router as order_index_router
 from app.routes.orders import router as orders_router
 
-__all__ = ["health_router", "items_router", "orders_router"]
+__all__ = ["backups_router", "health_router", "items_router", "order_index_router", "orders_router"]
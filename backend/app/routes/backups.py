@@ -0,0 +1,49 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from app import backup
+
+router = APIRouter(prefix="/admin/backups", tags=["admin"])
+
+
+class BackupRequest(BaseModel):
+    pages_per_step: int = Field(backup.PAGES_PER_STEP, ge=1)
+    pause_seconds: float = Field(backup.STEP_PAUSE, ge=0)
+    compress: bool = False
+
+
+@router.post("", status_code=202)
+def start_backup(data: Optional[BackupRequest] = None):
+    """Start an online backup in the background and return its progress record."""
+    data = data or BackupRequest()
+    run = backup.start_backup(pages_per_step=data.pages_per_step, pause=data.pause_seconds, compress=data.compress)
+    if run is None:
+        raise HTTPException(status_code=409, detail="A backup is already running")
+    return JSONResponse(status_code=202, content=run.to_dict())
+
+
+@router.get("")
+def list_backups():
+    """Backups started by this process, plus the backup files on disk."""
+    return {"runs": backup.list_backup_runs(), "files": backup.list_backup_files()}
+
+
+@router.get("/{backup_id}")
+def get_backup(backup_id: str):
+    """Progress and throughput of one backup."""
+    run = backup.get_backup(backup_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Backup not found")
+    return run.to_dict()
+
+
+@router.delete("/{backup_id}", status_code=202)
+def cancel_backup(backup_id: str):
+    """Stop a running backup after its current step; the partial file is removed."""
+    run = backup.cancel_backup(backup_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Backup not found")
+    return run.to_dict()
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 
+from app.admission import admission
+from app.order_index import order_index
+
 router = APIRouter()
 
 
@@ -7,3 +10,15 @@ router = APIRouter()
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@router.get("/health/admission")
+def admission_stats():
+    """Queue depth, in-flight requests and shed counts per route class."""
+    return admission.stats()
+
+
+@router.get("/health/order-index")
+def order_index_stats():
+    """Size, load time and estimated memory use of the in-memory order index."""
+    return {**order_index.stats(), "memory": order_index.memory_report()}
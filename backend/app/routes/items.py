@@ -1,10 +1,17 @@
-from fastapi import APIRouter, HTTPException
+import os
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
-from app.database import get_db
+from app.cache import LRUCache
+from app.database import fetch_in_chunks, get_db
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+# Hot rows served by get_item; every write path invalidates the ids it touches
+item_cache = LRUCache(maxsize=int(os.getenv("ITEM_CACHE_SIZE", "10000")))
+
 
 class ItemCreate(BaseModel):
     name: str
@@ -19,37 +26,135 @@ class ItemResponse(BaseModel):
     name: str
 
 
+class ItemBulkCreate(BaseModel):
+    items: List[ItemCreate]
+
+
+class ItemBulkUpdate(BaseModel):
+    items: List[ItemResponse]
+
+
+class ItemBulkDelete(BaseModel):
+    ids: List[int]
+
+
+def fetch_existing_ids(cursor, item_ids: List[int]) -> set:
+    """Return which of the given ids exist, using chunked IN queries."""
+    return {row["id"] for row in fetch_in_chunks(cursor, "SELECT id FROM items WHERE id IN ({placeholders})", item_ids)}
+
+
 @router.get("")
-def list_items():
+def list_items(
+    after_id: int = Query(0, ge=0, description="Return items with id greater than this (keyset cursor)"),
+    limit: int = Query(100, ge=1, le=1000)
+):
     """
-    List all items from the database.
+    List items in id order, one keyset page at a time.
+    Pass the returned next_after_id to fetch the following page.
     Uses raw SQL query (no ORM).
     """
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name FROM items ORDER BY id")
-            rows = cursor.fetchall()
-            items = [{"id": row["id"], "name": row["name"]} for row in rows]
-            return {"items": items}
+        with get_db() as cursor:
+            cursor.execute(
+                "SELECT id, name FROM items WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, limit)
+            )
+            items = [{"id": row["id"], "name": row["name"]} for row in cursor.fetchall()]
+            next_after_id = items[-1]["id"] if len(items) == limit else None
+            return {"items": items, "next_after_id": next_after_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@router.post("/bulk", status_code=201)
+def bulk_create_items(data: ItemBulkCreate):
+    """
+    Create many items with a single executemany.
+    Uses raw SQL query (no ORM).
+    """
+    try:
+        with get_db() as cursor:
+            # Take the write lock first so the new ids are exactly those above the old max
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT COALESCE(MAX(id), 0) AS max_id FROM items")
+            max_id = cursor.fetchone()["max_id"]
+            cursor.executemany(
+                "INSERT INTO items (name) VALUES (?)",
+                [(item.name,) for item in data.items]
+            )
+            cursor.execute("SELECT id, name FROM items WHERE id > ? ORDER BY id", (max_id,))
+            items = [{"id": row["id"], "name": row["name"]} for row in cursor.fetchall()]
+            return {"created_count": len(items), "items": items}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.put("/bulk")
+def bulk_update_items(data: ItemBulkUpdate):
+    """
+    Rename many items with a single executemany.
+    Ids that do not exist are reported in missing_ids.
+    Uses raw SQL query (no ORM).
+    """
+    try:
+        with get_db() as cursor:
+            item_ids = [item.id for item in data.items]
+            existing = fetch_existing_ids(cursor, item_ids)
+            updates = [item for item in data.items if item.id in existing]
+            cursor.executemany(
+                "UPDATE items SET name = ? WHERE id = ?",
+                [(item.name, item.id) for item in updates]
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    # Invalidate only after commit, so no reader can re-cache the old row
+    item_cache.invalidate(*existing)
+    return {
+        "updated_count": len(updates),
+        "items": [{"id": item.id, "name": item.name} for item in updates],
+        "missing_ids": [item_id for item_id in dict.fromkeys(item_ids) if item_id not in existing]
+    }
+
+
+@router.delete("/bulk")
+def bulk_delete_items(data: ItemBulkDelete):
+    """
+    Delete many items with a single executemany.
+    Uses raw SQL query (no ORM).
+    """
+    try:
+        with get_db() as cursor:
+            existing = fetch_existing_ids(cursor, data.ids)
+            deleted_ids = [item_id for item_id in dict.fromkeys(data.ids) if item_id in existing]
+            cursor.executemany(
+                "DELETE FROM items WHERE id = ?",
+                [(item_id,) for item_id in deleted_ids]
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    item_cache.invalidate(*deleted_ids)
+    return {"deleted_count": len(deleted_ids), "deleted_ids": deleted_ids}
+
+
 @router.get("/{item_id}")
 def get_item(item_id: int):
     """
-    Get a single item by ID.
+    Get a single item by ID, served from the in-process cache when hot.
     Uses raw SQL query (no ORM).
     """
+    cached = item_cache.get(item_id)
+    if cached is not None:
+        return dict(cached)
+    token = item_cache.token()
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
+        with get_db() as cursor:
             cursor.execute("SELECT id, name FROM items WHERE id = ?", (item_id,))
             row = cursor.fetchone()
             if row is None:
                 raise HTTPException(status_code=404, detail="Item not found")
-            return {"id": row["id"], "name": row["name"]}
+            item = {"id": row["id"], "name": row["name"]}
+            item_cache.set(item_id, item, token)
+            return dict(item)
     except HTTPException:
         raise
     except Exception as e:
@@ -63,8 +168,7 @@ def create_item(item: ItemCreate):
     Uses raw SQL query (no ORM).
     """
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
+        with get_db() as cursor:
             cursor.execute("INSERT INTO items (name) VALUES (?)", (item.name,))
             item_id = cursor.lastrowid
             return {"id": item_id, "name": item.name}
@@ -79,19 +183,17 @@ def update_item(item_id: int, item: ItemUpdate):
     Uses raw SQL query (no ORM).
     """
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            # Check if item exists
-            cursor.execute("SELECT id FROM items WHERE id = ?", (item_id,))
-            if cursor.fetchone() is None:
-                raise HTTPException(status_code=404, detail="Item not found")
-            # Update the item
+        with get_db() as cursor:
             cursor.execute("UPDATE items SET name = ? WHERE id = ?", (item.name, item_id))
-            return {"id": item_id, "name": item.name}
+            # No row touched means the item does not exist
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Item not found")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    item_cache.invalidate(item_id)
+    return {"id": item_id, "name": item.name}
 
 
 @router.delete("/{item_id}", status_code=204)
@@ -101,16 +203,14 @@ def delete_item(item_id: int):
     Uses raw SQL query (no ORM).
     """
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            # Check if item exists
-            cursor.execute("SELECT id FROM items WHERE id = ?", (item_id,))
-            if cursor.fetchone() is None:
-                raise HTTPException(status_code=404, detail="Item not found")
-            # Delete the item
+        with get_db() as cursor:
             cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
-            return None
+            # No row touched means the item does not exist
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Item not found")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    item_cache.invalidate(item_id)
+    return None
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException
+
+from app.order_index import order_index
+from app.routes.orders import STATUS_FILTERS
+
+# Under /admin rather than /health, so admission control limits these full scans
+router = APIRouter(prefix="/admin/order-index", tags=["admin"])
+
+
+@router.get("/check")
+def order_index_check():
+    """Compare the in-memory order index with the orders table (a full scan)."""
+    if not order_index.loaded:
+        raise HTTPException(status_code=409, detail="Order index is not loaded")
+    return order_index.check(STATUS_FILTERS)
+
+
+@router.post("/reload")
+def order_index_reload():
+    """Rebuild the index from SQLite, e.g. after archiving from another process or a failed refresh."""
+    if not order_index.enabled:
+        raise HTTPException(status_code=409, detail="Order index is disabled (ORDER_INDEX_ENABLED=1)")
+    order_index.reload()
+    return order_index.stats()
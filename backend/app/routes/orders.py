@@ -3,13 +3,19 @@ Orders API routes with CRUD and bulk operations.
 """
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Tuple
+from contextlib import nullcontext
+from datetime import date, datetime
+import base64
+import json
 import uuid
 import math
 
-from ..database import get_db
+from .. import archive, jobs
+from ..database import fetch_in_chunks, get_db
+from ..order_index import order_index
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
@@ -59,6 +65,19 @@ class OrdersListResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    next_after: Optional[str] = None
+
+
+class OrderListSpec(BaseModel):
+    status: str = "all"
+    sort_by: str = "order_number"
+    sort_dir: str = "desc"
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    after: Optional[str] = None
+    include_archived: bool = False
 
 
 class OrderStats(BaseModel):
@@ -68,6 +87,20 @@ class OrderStats(BaseModel):
     refunded_orders: int
 
 
+class TabCounts(BaseModel):
+    all: int
+    incomplete: int
+    overdue: int
+    ongoing: int
+    finished: int
+
+
+class DashboardResponse(BaseModel):
+    page: OrdersListResponse
+    stats: OrderStats
+    tab_counts: TabCounts
+
+
 class BulkStatusUpdate(BaseModel):
     order_ids: List[str]
     status: str
@@ -81,6 +114,91 @@ class BulkDelete(BaseModel):
     order_ids: List[str]
 
 
+class BatchGet(BaseModel):
+    order_ids: List[str]
+
+
+class BatchPatchItem(OrderUpdate):
+    id: str
+
+
+class BatchPatch(BaseModel):
+    updates: List[BatchPatchItem]
+
+
+# Values allowed by the CHECK constraints on the orders table
+ORDER_STATUSES = ("pending", "completed", "refunded")
+PAYMENT_STATUSES = ("paid", "unpaid")
+
+# WHERE clauses backing the frontend filter tabs ("all" means no filter)
+STATUS_FILTERS = {
+    "all": "",
+    "incomplete": "status = 'pending' AND payment_status = 'unpaid'",
+    "overdue": "status = 'pending'",
+    "ongoing": "status IN ('pending', 'completed') AND payment_status = 'unpaid'",
+    "finished": "status = 'completed' AND payment_status = 'paid'",
+}
+
+
+# Supported sorts: API name -> (column, index that serves the sort, column is unique)
+SORT_OPTIONS = {
+    "order_number": ("order_number", "idx_orders_list", True),
+    "order_date": ("order_date", "idx_orders_order_date", False),
+    "total_amount": ("total_amount", "idx_orders_total_amount", False),
+    "customer": ("customer_name", "idx_orders_customer_name", False),
+}
+
+# Public order fields mapped to the columns that back them, for sparse fieldsets
+ORDER_FIELD_COLUMNS = {
+    "id": ("id",),
+    "order_number": ("order_number",),
+    "customer": ("customer_name", "customer_email", "customer_avatar"),
+    "customer.name": ("customer_name",),
+    "customer.email": ("customer_email",),
+    "customer.avatar": ("customer_avatar",),
+    "order_date": ("order_date",),
+    "status": ("status",),
+    "total_amount": ("total_amount",),
+    "payment_status": ("payment_status",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+}
+
+
+def parse_fields(fields: str) -> List[str]:
+    """Validate a comma-separated `fields` parameter, keeping request order."""
+    requested = []
+    for field in fields.split(","):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in ORDER_FIELD_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {field}")
+        if field not in requested:
+            requested.append(field)
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    return requested
+
+
+def row_to_fields(row, fields: List[str]) -> dict:
+    """Convert a projected database row to a dict holding only the requested fields."""
+    data = {}
+    for field in fields:
+        if field == "customer":
+            data["customer"] = {
+                "name": row["customer_name"],
+                "email": row["customer_email"],
+                "avatar": row["customer_avatar"]
+            }
+        elif field.startswith("customer."):
+            key = field.split(".", 1)[1]
+            data.setdefault("customer", {})[key] = row[f"customer_{key}"]
+        else:
+            data[field] = row[field]
+    return data
+
+
 def row_to_order(row) -> OrderResponse:
     """Convert a database row to an OrderResponse."""
     return OrderResponse(
@@ -100,99 +218,368 @@ def row_to_order(row) -> OrderResponse:
     )
 
 
+def update_columns(order: OrderUpdate) -> dict:
+    """Map the fields set on a partial update to the columns they change."""
+    changes = {}
+
+    if order.customer:
+        if order.customer.name:
+            changes["customer_name"] = order.customer.name
+        if order.customer.email:
+            changes["customer_email"] = order.customer.email
+        if order.customer.avatar is not None:
+            changes["customer_avatar"] = order.customer.avatar
+
+    if order.status:
+        changes["status"] = order.status
+
+    if order.total_amount is not None:
+        changes["total_amount"] = order.total_amount
+
+    if order.payment_status:
+        changes["payment_status"] = order.payment_status
+
+    return changes
+
+
+def fetch_orders_by_ids(cursor, order_ids: List[str]) -> dict:
+    """Fetch rows for many ids with chunked primary-key IN queries."""
+    rows = fetch_in_chunks(cursor, "SELECT * FROM orders WHERE id IN ({placeholders})", order_ids)
+    return {row["id"]: row for row in rows}
+
+
 def get_next_order_number(cursor) -> str:
     """Generate the next order number."""
     cursor.execute("SELECT order_number FROM orders ORDER BY order_number DESC LIMIT 1")
     row = cursor.fetchone()
-    if row:
-        last_num = int(row["order_number"].replace("#ORD", ""))
+    # Archived orders keep their numbers, so never hand one out again
+    last_num = max(
+        int(row["order_number"].replace("#ORD", "")) if row else 0,
+        archive.max_archived_order_seq(cursor)
+    )
+    if last_num:
         return f"#ORD{last_num + 1}"
     return "#ORD1000"
 
 
+def fetch_order_counts(cursor) -> dict:
+    """Compute stats and per-tab counts in a single aggregate pass over orders."""
+    tab_sums = ",\n            ".join(
+        f"COALESCE(SUM({where}), 0) AS {tab}"
+        for tab, where in STATUS_FILTERS.items() if where
+    )
+    cursor.execute(f"""
+        SELECT
+            COUNT(*) AS total,
+            COALESCE(SUM(status = 'pending'), 0) AS pending,
+            COALESCE(SUM(status = 'completed'), 0) AS completed,
+            COALESCE(SUM(status = 'refunded'), 0) AS refunded,
+            {tab_sums}
+        FROM orders
+    """)
+    return dict(cursor.fetchone())
+
+
+def counts_to_stats(counts: dict) -> OrderStats:
+    """Build the dashboard card figures from aggregate counts."""
+    # Total orders this month (simplified - just count all for demo)
+    return OrderStats(
+        total_orders_this_month=counts["total"],
+        pending_orders=counts["pending"],
+        shipped_orders=counts["completed"],
+        refunded_orders=counts["refunded"]
+    )
+
+
+def validate_spec(spec: OrderListSpec):
+    """Reject sort/filter combinations the list query cannot serve."""
+    if spec.status not in STATUS_FILTERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported status: {spec.status}")
+    if spec.sort_by not in SORT_OPTIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort_by: {spec.sort_by}")
+    if spec.sort_dir not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="sort_dir must be asc or desc")
+    if spec.date_from and spec.date_to and spec.date_from > spec.date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    if spec.min_amount is not None and spec.max_amount is not None and spec.min_amount > spec.max_amount:
+        raise HTTPException(status_code=400, detail="min_amount must not be greater than max_amount")
+    if spec.after and spec.include_archived:
+        raise HTTPException(status_code=400, detail="after cannot be combined with include_archived")
+
+
+def spec_filters(spec: OrderListSpec) -> Tuple[str, list]:
+    """Return the WHERE expression (without WHERE) and params for a list spec."""
+    clauses = []
+    params = []
+
+    if STATUS_FILTERS.get(spec.status):
+        clauses.append(f"({STATUS_FILTERS[spec.status]})")
+    if spec.date_from:
+        clauses.append("order_date >= ?")
+        params.append(spec.date_from.isoformat())
+    if spec.date_to:
+        clauses.append("order_date <= ?")
+        params.append(spec.date_to.isoformat())
+    if spec.min_amount is not None:
+        clauses.append("total_amount >= ?")
+        params.append(spec.min_amount)
+    if spec.max_amount is not None:
+        clauses.append("total_amount <= ?")
+        params.append(spec.max_amount)
+
+    return " AND ".join(clauses), params
+
+
+def spec_order_by(spec: OrderListSpec) -> str:
+    """ORDER BY expression for a spec; non-unique sort keys are tie-broken on id."""
+    column, _, unique = SORT_OPTIONS[spec.sort_by]
+    direction = spec.sort_dir.upper()
+    return f"{column} {direction}" if unique else f"{column} {direction}, id {direction}"
+
+
+def encode_after(spec: OrderListSpec, row) -> str:
+    """Opaque keyset token pointing just past `row` in the spec's sort order."""
+    column = SORT_OPTIONS[spec.sort_by][0]
+    token = {"sort_by": spec.sort_by, "sort_dir": spec.sort_dir, "key": [row[column], row["id"]]}
+    return base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+
+
+def decode_after(spec: OrderListSpec) -> list:
+    """Decode and check an `after` token against the spec it is used with."""
+    try:
+        token = json.loads(base64.urlsafe_b64decode(spec.after.encode()))
+        key = token["key"]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid after token")
+    # A sort value of the sort column's type and an id, as written by encode_after
+    value_type = (int, float) if spec.sort_by == "total_amount" else str
+    if not (
+        isinstance(key, list) and len(key) == 2
+        and isinstance(key[0], value_type) and not isinstance(key[0], bool)
+        and isinstance(key[1], str)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid after token")
+    if token.get("sort_by") != spec.sort_by or token.get("sort_dir") != spec.sort_dir:
+        raise HTTPException(status_code=400, detail="after token was issued for a different sort")
+    return key
+
+
+def build_page_query(spec: OrderListSpec, columns: str, keyset: Optional[list] = None) -> Tuple[str, list]:
+    """
+    Build the page SELECT for a spec, returning (sql, params) without LIMIT/OFFSET values.
+
+    INDEXED BY pins the sort's index so rows come out already ordered, never
+    through a temp B-tree sort, whatever filters are combined with it.
+    """
+    column, index, unique = SORT_OPTIONS[spec.sort_by]
+    where, params = spec_filters(spec)
+    clauses = [where] if where else []
+
+    if keyset is not None:
+        op = "<" if spec.sort_dir == "desc" else ">"
+        if unique:
+            clauses.append(f"{column} {op} ?")
+            params.append(keyset[0])
+        else:
+            clauses.append(f"({column}, id) {op} (?, ?)")
+            params.extend(keyset)
+
+    where_sql = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT {columns} FROM orders INDEXED BY {index}{where_sql} ORDER BY {spec_order_by(spec)} LIMIT ? OFFSET ?"
+    return sql, params
+
+
+def select_page(cursor, spec: OrderListSpec, columns: str, page: int, limit: int, total: Optional[int] = None):
+    """Return (total, rows) for one page of orders matching a spec. cursor is unused when the index serves it."""
+    offset = (page - 1) * limit
+
+    if order_index.serves(spec):
+        after = decode_after(spec)[0] if spec.after else None
+        return order_index.page(spec.status, spec.sort_dir == "desc", offset, limit, after)
+
+    if cursor is None:
+        # The caller expected the index, but a failed refresh switched it off in between
+        with get_db() as cursor:
+            return select_page(cursor, spec, columns, page, limit, total)
+
+    where, params = spec_filters(spec)
+
+    if spec.include_archived:
+        column = SORT_OPTIONS[spec.sort_by][0]
+        return archive.fetch_page_with_archives(
+            cursor, where, params, columns, spec_order_by(spec),
+            sort_key=lambda row: (row[column], row["id"]),
+            descending=spec.sort_dir == "desc",
+            limit=limit, offset=offset
+        )
+
+    if total is None:
+        where_sql = f" WHERE {where}" if where else ""
+        cursor.execute(f"SELECT COUNT(*) as count FROM orders{where_sql}", params)
+        total = cursor.fetchone()["count"]
+
+    keyset = None
+    if spec.after:
+        # Keyset pages start right after the token, so page only labels the response
+        keyset = decode_after(spec)
+        offset = 0
+
+    sql, params = build_page_query(spec, columns, keyset)
+    cursor.execute(sql, params + [limit, offset])
+    return total, cursor.fetchall()
+
+
+def next_after(spec: OrderListSpec, rows: list, limit: int) -> Optional[str]:
+    """Token for the following page, or None on the last page."""
+    if spec.include_archived or len(rows) < limit:
+        return None
+    return encode_after(spec, rows[-1])
+
+
+def fetch_orders_page(
+    cursor, spec: OrderListSpec, page: int, limit: int, total: Optional[int] = None
+) -> OrdersListResponse:
+    """Fetch one page of orders for a spec, counting the matches if needed."""
+    total, rows = select_page(cursor, spec, "*", page, limit, total)
+
+    # Calculate pagination
+    total_pages = math.ceil(total / limit) if total > 0 else 1
+    orders = [row_to_order(row) for row in rows]
+
+    return OrdersListResponse(
+        orders=orders,
+        total=total,
+        page=page,
+        limit=limit,
+        total_pages=total_pages,
+        next_after=next_after(spec, rows, limit)
+    )
+
+
+def fetch_orders_projection(cursor, spec: OrderListSpec, page: int, limit: int, fields: List[str]) -> dict:
+    """Fetch one page selecting only the columns behind the requested fields."""
+    columns = []
+    for field in fields:
+        columns.extend(c for c in ORDER_FIELD_COLUMNS[field] if c not in columns)
+    # Keyset tokens and the cross-archive merge need the sort key and id
+    for column in (SORT_OPTIONS[spec.sort_by][0], "id"):
+        if column not in columns:
+            columns.append(column)
+
+    total, rows = select_page(cursor, spec, ", ".join(columns), page, limit)
+    total_pages = math.ceil(total / limit) if total > 0 else 1
+    orders = [row_to_fields(row, fields) for row in rows]
+
+    return {
+        "orders": orders,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "total_pages": total_pages,
+        "next_after": next_after(spec, rows, limit)
+    }
+
+
 @router.get("/stats", response_model=OrderStats)
 def get_order_stats():
     """Get order statistics for dashboard cards."""
+    if order_index.loaded:
+        return counts_to_stats(order_index.counts())
     with get_db() as cursor:
-        # Total orders this month (simplified - just count all for demo)
-        cursor.execute("SELECT COUNT(*) as count FROM orders")
-        total = cursor.fetchone()["count"]
+        return counts_to_stats(fetch_order_counts(cursor))
 
-        # Pending orders
-        cursor.execute("SELECT COUNT(*) as count FROM orders WHERE status = 'pending'")
-        pending = cursor.fetchone()["count"]
 
-        # Shipped/Completed orders
-        cursor.execute("SELECT COUNT(*) as count FROM orders WHERE status = 'completed'")
-        shipped = cursor.fetchone()["count"]
-
-        # Refunded orders
-        cursor.execute("SELECT COUNT(*) as count FROM orders WHERE status = 'refunded'")
-        refunded = cursor.fetchone()["count"]
-
-        return OrderStats(
-            total_orders_this_month=total,
-            pending_orders=pending,
-            shipped_orders=shipped,
-            refunded_orders=refunded
-        )
+def build_dashboard(cursor, counts: dict, status: str, page: int, limit: int) -> DashboardResponse:
+    """Assemble the dashboard from aggregate counts plus one orders page."""
+    tab_counts = TabCounts(
+        all=counts["total"],
+        **{tab: counts[tab] for tab, where in STATUS_FILTERS.items() if where}
+    )
+    # Reuse the tab count instead of a second COUNT(*) for the page total
+    total = counts[status] if STATUS_FILTERS.get(status) else counts["total"]
+    orders_page = fetch_orders_page(cursor, OrderListSpec(status=status), page, limit, total=total)
+
+    return DashboardResponse(
+        page=orders_page,
+        stats=counts_to_stats(counts),
+        tab_counts=tab_counts
+    )
 
 
-@router.get("", response_model=OrdersListResponse)
-def get_orders(
+@router.get("/dashboard", response_model=DashboardResponse)
+def get_dashboard(
     status: str = Query("all", description="Filter status: all, incomplete, overdue, ongoing, finished"),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100)
 ):
-    """Get all orders with pagination and filtering."""
-    with get_db() as cursor:
-        # Build query based on status filter
-        base_query = "FROM orders"
-        params = []
-
-        if status == "incomplete":
-            base_query += " WHERE status = 'pending' AND payment_status = 'unpaid'"
-        elif status == "overdue":
-            base_query += " WHERE status = 'pending'"
-        elif status == "ongoing":
-            base_query += " WHERE status IN ('pending', 'completed') AND payment_status = 'unpaid'"
-        elif status == "finished":
-            base_query += " WHERE status = 'completed' AND payment_status = 'paid'"
-        # "all" means no filter
-
-        # Get total count
-        cursor.execute(f"SELECT COUNT(*) as count {base_query}", params)
-        total = cursor.fetchone()["count"]
+    """Get an orders page, stats and filter tab counts in one read transaction."""
+    validate_spec(OrderListSpec(status=status))
+    if order_index.loaded:
+        # Holding the index lock keeps the page and the counts in step
+        with order_index.lock:
+            return build_dashboard(None, order_index.counts(), status, page, limit)
 
-        # Calculate pagination
-        offset = (page - 1) * limit
-        total_pages = math.ceil(total / limit) if total > 0 else 1
+    with get_db() as cursor:
+        # Pin a single snapshot so the page and the counts agree
+        cursor.execute("BEGIN")
+        return build_dashboard(cursor, fetch_order_counts(cursor), status, page, limit)
 
-        # Get orders with pagination
-        cursor.execute(
-            f"SELECT * {base_query} ORDER BY order_number DESC LIMIT ? OFFSET ?",
-            params + [limit, offset]
-        )
-        rows = cursor.fetchall()
 
-        orders = [row_to_order(row) for row in rows]
+@router.get("", response_model=OrdersListResponse)
+def get_orders(
+    status: str = Query("all", description="Filter status: all, incomplete, overdue, ongoing, finished"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status"),
+    include_archived: bool = Query(False, description="Also search archived orders (slower)"),
+    sort_by: str = Query("order_number", description="Sort: order_number, order_date, total_amount, customer"),
+    sort_dir: str = Query("desc", description="Sort direction: asc or desc"),
+    date_from: Optional[date] = Query(None, description="Earliest order_date (inclusive)"),
+    date_to: Optional[date] = Query(None, description="Latest order_date (inclusive)"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Minimum total_amount (inclusive)"),
+    max_amount: Optional[float] = Query(None, ge=0, description="Maximum total_amount (inclusive)"),
+    after: Optional[str] = Query(None, description="Keyset token from next_after; replaces page")
+):
+    """Get all orders with pagination, sorting and filtering."""
+    spec = OrderListSpec(
+        status=status,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        date_from=date_from,
+        date_to=date_to,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        after=after,
+        include_archived=include_archived
+    )
+    validate_spec(spec)
 
-        return OrdersListResponse(
-            orders=orders,
-            total=total,
-            page=page,
-            limit=limit,
-            total_pages=total_pages
-        )
+    # Pages the in-memory index can serve skip opening a connection
+    with nullcontext() if order_index.serves(spec) else get_db() as cursor:
+        if fields is not None:
+            # Sparse fieldsets skip OrderResponse so omitted fields stay omitted
+            requested = parse_fields(fields)
+            return JSONResponse(fetch_orders_projection(cursor, spec, page, limit, requested))
+        return fetch_orders_page(cursor, spec, page, limit)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_order(order_id: str):
+def get_order(order_id: str, include_archived: bool = Query(False, description="Fall back to archived orders")):
     """Get a single order by ID."""
+    if order_index.loaded:
+        record = order_index.get(order_id)
+        if record:
+            return row_to_order(record)
+        if not include_archived:
+            raise HTTPException(status_code=404, detail="Order not found")
+
     with get_db() as cursor:
         cursor.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
         row = cursor.fetchone()
 
+        if not row and include_archived:
+            row = archive.find_archived_order(cursor, order_id)
+
         if not row:
             raise HTTPException(status_code=404, detail="Order not found")
 
@@ -226,8 +613,10 @@ def create_order(order: OrderCreate):
         ))
 
         cursor.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
-        row = cursor.fetchone()
-        return row_to_order(row)
+        created = row_to_order(cursor.fetchone())
+
+    order_index.refresh([order_id])
+    return created
 
 
 @router.put("/{order_id}", response_model=OrderResponse)
@@ -240,138 +629,290 @@ def update_order(order_id: str, order: OrderUpdate):
         if not row:
             raise HTTPException(status_code=404, detail="Order not found")
 
-        # Build update query dynamically
-        updates = []
-        params = []
-
-        if order.customer:
-            if order.customer.name:
-                updates.append("customer_name = ?")
-                params.append(order.customer.name)
-            if order.customer.email:
-                updates.append("customer_email = ?")
-                params.append(order.customer.email)
-            if order.customer.avatar is not None:
-                updates.append("customer_avatar = ?")
-                params.append(order.customer.avatar)
-
-        if order.status:
-            updates.append("status = ?")
-            params.append(order.status)
-
-        if order.total_amount is not None:
-            updates.append("total_amount = ?")
-            params.append(order.total_amount)
-
-        if order.payment_status:
-            updates.append("payment_status = ?")
-            params.append(order.payment_status)
-
-        if updates:
-            updates.append("updated_at = ?")
-            params.append(datetime.utcnow().isoformat())
-            params.append(order_id)
-
+        changes = update_columns(order)
+        if changes:
+            changes["updated_at"] = datetime.utcnow().isoformat()
             cursor.execute(
-                f"UPDATE orders SET {', '.join(updates)} WHERE id = ?",
-                params
+                f"UPDATE orders SET {', '.join(f'{col} = ?' for col in changes)} WHERE id = ?",
+                list(changes.values()) + [order_id]
             )
 
+        cursor.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
+        updated = row_to_order(cursor.fetchone())
+
+    order_index.refresh([order_id])
+    return updated
+
+
+# Bulk Operations
+#
+# Each apply_* function processes a list of ids on an open cursor and returns
+# one result per id (None when the order was not found). The HTTP handlers run
+# them over every id at once; background jobs run them chunk by chunk.
+
+def apply_bulk_status(cursor, order_ids: List[str], params: dict) -> List[Optional[dict]]:
+    """Set the status of each order."""
+    now = datetime.utcnow().isoformat()
+    results = []
+
+    for order_id in order_ids:
+        cursor.execute(
+            "UPDATE orders SET status = ?, updated_at = ? WHERE id = ?",
+            (params["status"], now, order_id)
+        )
+        results.append({"id": order_id, "status": params["status"]} if cursor.rowcount > 0 else None)
+
+    return results
+
+
+def apply_bulk_duplicate(cursor, order_ids: List[str], params: dict) -> List[Optional[dict]]:
+    """Insert a copy of each order under a new id and order number."""
+    now = datetime.utcnow().isoformat()
+    results = []
+
+    for order_id in order_ids:
         cursor.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
         row = cursor.fetchone()
-        return row_to_order(row)
 
+        if not row:
+            results.append(None)
+            continue
 
-@router.delete("/{order_id}", status_code=204)
-def delete_order(order_id: str):
-    """Delete an order."""
-    with get_db() as cursor:
-        cursor.execute("SELECT 1 FROM orders WHERE id = ?", (order_id,))
-        if not cursor.fetchone():
-            raise HTTPException(status_code=404, detail="Order not found")
+        new_id = str(uuid.uuid4())
+        new_order_number = get_next_order_number(cursor)
+
+        cursor.execute("""
+            INSERT INTO orders (id, order_number, customer_name, customer_email, customer_avatar, order_date, status, total_amount, payment_status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            new_id,
+            new_order_number,
+            row["customer_name"],
+            row["customer_email"],
+            row["customer_avatar"],
+            row["order_date"],
+            row["status"],
+            row["total_amount"],
+            row["payment_status"],
+            now,
+            now
+        ))
+
+        results.append({
+            "id": new_id,
+            "order_number": new_order_number,
+            "original_order_id": order_id
+        })
+
+    return results
+
+
+def apply_bulk_delete(cursor, order_ids: List[str], params: dict) -> List[Optional[dict]]:
+    """Delete each order."""
+    results = []
 
+    for order_id in order_ids:
         cursor.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+        results.append({"id": order_id} if cursor.rowcount > 0 else None)
 
+    return results
+
+
+jobs.register_handler("bulk_status", apply_bulk_status)
+jobs.register_handler("bulk_duplicate", apply_bulk_duplicate)
+jobs.register_handler("bulk_delete", apply_bulk_delete)
+
+
+def refresh_order_index(kind: str, order_ids: List[str], results: List[Optional[dict]]):
+    """Apply a committed background chunk to the in-memory index; duplicates add their new ids."""
+    order_index.refresh(order_ids + [result["id"] for result in results if result])
+
+
+jobs.on_chunk_committed(refresh_order_index)
+
+
+def start_bulk_job(kind: str, order_ids: List[str], params: Optional[dict] = None) -> JSONResponse:
+    """Queue a bulk operation as a background job and answer 202 with its id."""
+    return JSONResponse(status_code=202, content=jobs.create_job(kind, order_ids, params))
 
-# Bulk Operations
 
 @router.put("/bulk/status")
-def bulk_update_status(data: BulkStatusUpdate):
+def bulk_update_status(
+    data: BulkStatusUpdate,
+    background: bool = Query(False, description="Run as a background job and return its id")
+):
     """Bulk update status for multiple orders."""
-    with get_db() as cursor:
-        now = datetime.utcnow().isoformat()
-        updated = []
+    # Checked up front, so a background job cannot be queued only to fail in the worker
+    if data.status not in ORDER_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {data.status}")
+    params = {"status": data.status}
+    if background:
+        return start_bulk_job("bulk_status", data.order_ids, params)
 
-        for order_id in data.order_ids:
-            cursor.execute(
-                "UPDATE orders SET status = ?, updated_at = ? WHERE id = ?",
-                (data.status, now, order_id)
-            )
-            if cursor.rowcount > 0:
-                updated.append({"id": order_id, "status": data.status})
+    with get_db() as cursor:
+        updated = [result for result in apply_bulk_status(cursor, data.order_ids, params) if result]
 
-        return {
-            "updated_count": len(updated),
-            "orders": updated
-        }
+    order_index.refresh([result["id"] for result in updated])
+    return {
+        "updated_count": len(updated),
+        "orders": updated
+    }
 
 
 @router.post("/bulk/duplicate", status_code=201)
-def bulk_duplicate(data: BulkDuplicate):
+def bulk_duplicate(
+    data: BulkDuplicate,
+    background: bool = Query(False, description="Run as a background job and return its id")
+):
     """Duplicate multiple orders."""
-    with get_db() as cursor:
-        new_orders = []
-        now = datetime.utcnow().isoformat()
-
-        for order_id in data.order_ids:
-            cursor.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
-            row = cursor.fetchone()
+    if background:
+        return start_bulk_job("bulk_duplicate", data.order_ids)
 
-            if row:
-                new_id = str(uuid.uuid4())
-                new_order_number = get_next_order_number(cursor)
-
-                cursor.execute("""
-                    INSERT INTO orders (id, order_number, customer_name, customer_email, customer_avatar, order_date, status, total_amount, payment_status, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    new_id,
-                    new_order_number,
-                    row["customer_name"],
-                    row["customer_email"],
-                    row["customer_avatar"],
-                    row["order_date"],
-                    row["status"],
-                    row["total_amount"],
-                    row["payment_status"],
-                    now,
-                    now
-                ))
-
-                new_orders.append({
-                    "id": new_id,
-                    "order_number": new_order_number,
-                    "original_order_id": order_id
-                })
+    with get_db() as cursor:
+        new_orders = [result for result in apply_bulk_duplicate(cursor, data.order_ids, {}) if result]
 
-        return {
-            "duplicated_count": len(new_orders),
-            "new_orders": new_orders
-        }
+    order_index.refresh([result["id"] for result in new_orders])
+    return {
+        "duplicated_count": len(new_orders),
+        "new_orders": new_orders
+    }
 
 
 @router.delete("/bulk")
-def bulk_delete(data: BulkDelete):
+def bulk_delete(
+    data: BulkDelete,
+    background: bool = Query(False, description="Run as a background job and return its id")
+):
     """Bulk delete multiple orders."""
+    if background:
+        return start_bulk_job("bulk_delete", data.order_ids)
+
+    with get_db() as cursor:
+        deleted_ids = [result["id"] for result in apply_bulk_delete(cursor, data.order_ids, {}) if result]
+
+    order_index.refresh(deleted_ids)
+    return {
+        "deleted_count": len(deleted_ids),
+        "deleted_ids": deleted_ids
+    }
+
+
+# Background Jobs
+
+@router.get("/jobs/{job_id}")
+def get_bulk_job(
+    job_id: str,
+    results_offset: int = Query(0, ge=0),
+    results_limit: int = Query(100, ge=1, le=1000)
+):
+    """Get a background bulk job's progress and a page of its per-item results."""
+    job = jobs.get_job(job_id, results_offset, results_limit)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.delete("/jobs/{job_id}", status_code=202)
+def cancel_bulk_job(job_id: str):
+    """Cancel a background bulk job. Chunks already committed stay applied."""
+    status = jobs.cancel_job(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"id": job_id, "status": status, "cancel_requested": True}
+
+
+# Batch Operations
+
+@router.post("/batch-get")
+def batch_get(data: BatchGet):
+    """Fetch many orders by id in one request, with a result per requested id."""
     with get_db() as cursor:
-        deleted_ids = []
+        rows = fetch_orders_by_ids(cursor, data.order_ids)
 
+        results = []
         for order_id in data.order_ids:
-            cursor.execute("DELETE FROM orders WHERE id = ?", (order_id,))
-            if cursor.rowcount > 0:
-                deleted_ids.append(order_id)
+            row = rows.get(order_id)
+            if row:
+                results.append({"id": order_id, "found": True, "order": row_to_order(row)})
+            else:
+                results.append({"id": order_id, "found": False, "order": None})
 
         return {
-            "deleted_count": len(deleted_ids),
-            "deleted_ids": deleted_ids
+            "found_count": sum(1 for result in results if result["found"]),
+            "results": results
         }
+
+
+@router.patch("/batch")
+def batch_patch(data: BatchPatch):
+    """Apply a different partial update to each order in one transaction."""
+    with get_db() as cursor:
+        # Take the write lock before the existence check, so no order can be deleted in between
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Merge repeated ids so each order gets a single UPDATE (later values win)
+        merged = {}
+        errors = {}
+        for item in data.updates:
+            changes = update_columns(item)
+            if "status" in changes and changes["status"] not in ORDER_STATUSES:
+                errors[item.id] = f"Invalid status: {changes['status']}"
+            elif "payment_status" in changes and changes["payment_status"] not in PAYMENT_STATUSES:
+                errors[item.id] = f"Invalid payment_status: {changes['payment_status']}"
+            else:
+                merged.setdefault(item.id, {}).update(changes)
+
+        # An order with any invalid item is left untouched
+        for order_id in errors:
+            merged.pop(order_id, None)
+
+        existing = fetch_orders_by_ids(cursor, list(merged))
+
+        # Group orders changing the same columns into one executemany each
+        now = datetime.utcnow().isoformat()
+        groups = {}
+        for order_id, changes in merged.items():
+            if order_id in existing and changes:
+                groups.setdefault(tuple(changes), []).append(
+                    list(changes.values()) + [now, order_id]
+                )
+
+        for columns, params in groups.items():
+            assignments = ", ".join(f"{col} = ?" for col in columns + ("updated_at",))
+            cursor.executemany(f"UPDATE orders SET {assignments} WHERE id = ?", params)
+
+        rows = fetch_orders_by_ids(cursor, [order_id for order_id in merged if order_id in existing])
+
+        results = []
+        for order_id in dict.fromkeys(item.id for item in data.updates):
+            if order_id in errors:
+                results.append({"id": order_id, "result": "invalid", "detail": errors[order_id], "order": None})
+            elif order_id not in rows:
+                results.append({"id": order_id, "result": "not_found", "detail": "Order not found", "order": None})
+            else:
+                results.append({
+                    "id": order_id,
+                    "result": "updated" if merged[order_id] else "unchanged",
+                    "detail": None,
+                    "order": row_to_order(rows[order_id])
+                })
+
+    order_index.refresh(list(rows))
+    return {
+        "updated_count": sum(1 for result in results if result["result"] == "updated"),
+        "results": results
+    }
+
+
+# Registered last so it does not shadow DELETE /orders/bulk
+@router.delete("/{order_id}", status_code=204)
+def delete_order(order_id: str):
+    """Delete an order."""
+    with get_db() as cursor:
+        cursor.execute("SELECT 1 FROM orders WHERE id = ?", (order_id,))
+        if not cursor.fetchone():
+            raise HTTPException(status_code=404, detail="Order not found")
+
+        cursor.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+
+    order_index.refresh([order_id])
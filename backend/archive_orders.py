@@ -0,0 +1,49 @@
+"""
+Order Archiver
+
+Moves old orders in a terminal state out of the hot orders table into
+per-month archive databases, in small committed batches. Safe to run from
+cron while the API is serving traffic, and safe to interrupt and re-run.
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from app.archive import ARCHIVE_DIR, archive_orders, list_archives
+from app.database import get_db
+
+
+def print_archives():
+    """List archived periods from the catalog."""
+    with get_db() as cursor:
+        archives = list_archives(cursor)
+
+    print(f"\nArchives in {ARCHIVE_DIR}:")
+    print("-" * 60)
+    for archive in archives:
+        print(f"{archive['period']}  {archive['order_count']:>8} orders  {archive['filename']}")
+    print("-" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old terminal orders")
+    parser.add_argument("action", choices=["run", "list"], help="run (archive now) or list (show archives)")
+    cutoff = parser.add_mutually_exclusive_group()
+    cutoff.add_argument("--before", help="Archive orders dated before this day (YYYY-MM-DD)")
+    cutoff.add_argument("--older-than-days", type=int, default=365, help="Archive orders older than N days (default: 365)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Orders moved per committed batch")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after N batches")
+
+    args = parser.parse_args()
+
+    if args.action == "list":
+        print_archives()
+    else:
+        before = args.before or (date.today() - timedelta(days=args.older_than_days)).isoformat()
+        summary = archive_orders(
+            before,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+            progress=lambda s: print(f"batch {s['batches']}: {s['archived']} orders archived")
+        )
+        print(f"Archived {summary['archived']} orders dated before {before} into {len(summary['periods'])} period(s).")
@@ -0,0 +1,66 @@
+"""
+Online Database Backup
+
+Copies the live database with the SQLite backup API a few pages at a time,
+pausing between steps, so it can run while the API is serving writes.
+
+Usage:
+    python backup_db.py run [--output PATH] [--pages-per-step N] [--pause S] [--compress]
+    python backup_db.py list
+"""
+
+import argparse
+import sys
+
+from app.backup import (
+    BACKUP_DIR, PAGES_PER_STEP, STEP_PAUSE, Backup, default_path, list_backup_files, run_backup
+)
+
+
+def print_progress(backup: Backup):
+    """Print one progress line per 5% (and the final line)."""
+    info = backup.to_dict()
+    step = int(info["progress"] * 20)
+    if info["status"] == "running" and step == getattr(print_progress, "last_step", None):
+        return
+    print_progress.last_step = step
+    print(
+        f"{info['progress'] * 100:5.1f}%  {info['copied_mb']:>9.1f} MB  "
+        f"{info['mb_per_second']:>7.1f} MB/s  steps {info['steps']}  restarts {info['restarts']}  [{info['status']}]"
+    )
+
+
+def print_backups():
+    """List backup files in BACKUP_DIR."""
+    print(f"\nBackups in {BACKUP_DIR}:")
+    print("-" * 60)
+    for backup in list_backup_files():
+        print(f"{backup['modified_at']}  {backup['bytes'] / 2**20:>10.1f} MB  {backup['filename']}")
+    print("-" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Online SQLite backup")
+    parser.add_argument("action", choices=["run", "list"], help="run (back up now) or list (show backups)")
+    parser.add_argument("--output", help=f"Backup file (default: timestamped file in {BACKUP_DIR})")
+    parser.add_argument("--pages-per-step", type=int, default=PAGES_PER_STEP, help="Pages copied per step")
+    parser.add_argument("--pause", type=float, default=STEP_PAUSE, help="Seconds to pause between steps")
+    parser.add_argument("--compress", action="store_true", help="Write a gzip-compressed .db.gz file")
+
+    args = parser.parse_args()
+
+    if args.action == "list":
+        print_backups()
+    else:
+        output = args.output or default_path(args.compress)
+        if args.compress and not output.endswith(".gz"):
+            output += ".gz"
+        backup = run_backup(Backup(output, args.pages_per_step, args.pause, args.compress), progress=print_progress)
+        info = backup.to_dict()
+        if info["status"] != "completed":
+            print(f"Backup {info['status']}: {info['error']}")
+            sys.exit(1)
+        print(
+            f"Backed up {info['copied_mb']} MB to {output} ({info['output_bytes'] / 2**20:.1f} MB on disk) "
+            f"in {info['elapsed_seconds']} s, {info['mb_per_second']} MB/s, journal mode {info['journal_mode']}."
+        )
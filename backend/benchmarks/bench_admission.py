@@ -0,0 +1,84 @@
+"""
+Overload test: latency of admitted requests with and without admission control.
+
+Drives the ASGI app in-process with an open-loop arrival rate above what the
+server can complete (mostly GET /orders/{id}, plus updates and bulk
+duplicates). Without admission control every request queues and latency
+grows for the whole run. With it, excess requests get a fast 503 and the p99
+of admitted requests stays bounded by the queue deadlines.
+
+Usage:
+    python benchmarks/bench_admission.py --orders 50000 --rate 3000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from common import asgi_request, get_connection, percentiles, setup_database
+
+from app.admission import admission
+from app.main import app
+
+
+async def run_load(ids, rate: int, seconds: float, seed: int = 11):
+    rng = random.Random(seed)
+    results = []
+
+    async def one(kind, method, path, body):
+        start = time.perf_counter()
+        status = await asgi_request(app, method, path, body)
+        results.append((kind, status, (time.perf_counter() - start) * 1000))
+
+    tasks = []
+    total = int(rate * seconds)
+    start = time.perf_counter()
+    for i in range(total):
+        # Open loop: arrivals follow the clock, not completions
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = rng.random()
+        if roll < 0.85:
+            request = ("read", "GET", f"/orders/{rng.choice(ids)}", None)
+        elif roll < 0.98:
+            request = ("write", "PUT", f"/orders/{rng.choice(ids)}", {"total_amount": round(rng.uniform(5, 500), 2)})
+        else:
+            request = ("bulk", "POST", "/orders/bulk/duplicate", {"order_ids": rng.sample(ids, 20)})
+        tasks.append(asyncio.create_task(one(*request)))
+    await asyncio.gather(*tasks)
+    return results
+
+
+def summarize(label: str, results):
+    print(f"\n{label}")
+    for kind in ("read", "write", "bulk"):
+        admitted = [ms for k, status, ms in results if k == kind and status != 503]
+        shed = [ms for k, status, ms in results if k == kind and status == 503]
+        p = percentiles(admitted)
+        shed_p = percentiles(shed)
+        print(
+            f"  {kind:<5} admitted {len(admitted):6d}  p50 {p['p50']:8.1f} ms  p99 {p['p99']:8.1f} ms  "
+            f"max {p['max']:8.1f} ms | shed {len(shed):6d} (p99 {shed_p['p99']:.1f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Admission control overload test")
+    parser.add_argument("--orders", type=int, default=50_000, help="Number of orders to seed")
+    parser.add_argument("--rate", type=int, default=3_000, help="Offered requests per second")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of the offered load")
+    args = parser.parse_args()
+
+    setup_database(args.orders)
+    conn = get_connection()
+    ids = [row["id"] for row in conn.execute("SELECT id FROM orders LIMIT 20000")]
+    conn.close()
+
+    admission.enabled = False
+    summarize("Admission control OFF", asyncio.run(run_load(ids, args.rate, args.seconds)))
+
+    admission.enabled = True
+    summarize("Admission control ON", asyncio.run(run_load(ids, args.rate, args.seconds)))
+    print(f"\n{admission.stats()}")
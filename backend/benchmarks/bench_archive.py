@@ -0,0 +1,60 @@
+"""
+Benchmark: hot-path latency before and after archiving 95% of orders.
+
+Seeds orders, rewrites the oldest 95% into terminal states, measures the
+dashboard read path, archives them with app.archive, and measures again.
+
+Usage:
+    python benchmarks/bench_archive.py --orders 500000
+"""
+
+import argparse
+import time
+
+from common import call_route, get_connection, report, setup_database, timeit
+
+from app.archive import TERMINAL_WHERE, archive_orders
+from app.routes.orders import get_dashboard, get_order_stats, get_orders
+
+
+def hot_path(label: str, repeat: int):
+    print(f"\n{label}")
+    report("GET /orders (all, page 1)", timeit(lambda: call_route(get_orders, status="all", page=1, limit=10), repeat))
+    report("GET /orders (finished, page 1)", timeit(lambda: call_route(get_orders, status="finished", page=1, limit=10), repeat))
+    report("GET /orders/stats", timeit(get_order_stats, repeat))
+    report("GET /orders/dashboard", timeit(lambda: call_route(get_dashboard, status="all", page=1, limit=10), repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archival benchmark")
+    parser.add_argument("--orders", type=int, default=500_000, help="Number of orders to seed")
+    parser.add_argument("--share", type=float, default=0.95, help="Fraction of orders to archive")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per scenario")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="Orders per archive batch")
+    args = parser.parse_args()
+
+    path = setup_database(args.orders)
+    conn = get_connection()
+    cutoff = conn.execute(
+        "SELECT order_date FROM orders ORDER BY order_date LIMIT 1 OFFSET ?",
+        (int(args.orders * args.share),)
+    ).fetchone()[0]
+    # Everything before the cutoff has long since settled
+    conn.execute(
+        f"UPDATE orders SET status = 'completed', payment_status = 'paid' "
+        f"WHERE order_date < ? AND NOT {TERMINAL_WHERE} AND status != 'refunded'",
+        (cutoff,)
+    )
+    conn.commit()
+    conn.close()
+    print(f"\nDatabase: {path} ({args.orders} orders, cutoff {cutoff})")
+
+    hot_path("Before archiving", args.repeat)
+
+    start = time.perf_counter()
+    summary = archive_orders(cutoff, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"\nArchived {summary['archived']} orders into {len(summary['periods'])} monthly files "
+          f"in {elapsed:.1f} s ({summary['archived'] / elapsed:.0f} orders/s)")
+
+    hot_path("After archiving", args.repeat)
@@ -0,0 +1,154 @@
+"""
+Benchmark: API write latency while an online backup of a multi-GB database runs.
+
+The database is padded to --size-gb with a blob table, then writer threads
+run PUT /orders/{id} (update_order) and POST /orders (create_order)
+continuously. Write latency is measured in three phases:
+
+- baseline:  no backup running
+- stepped:   run_backup with --pages-per-step and --pause (the default mode)
+- one step:  run_backup copying everything in a single step (pages=-1), for comparison
+
+Usage:
+    python benchmarks/bench_backup.py --size-gb 2
+    python benchmarks/bench_backup.py --size-gb 4 --pages-per-step 512 --pause 0.01 --compress
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+
+from common import get_connection, percentiles, setup_database
+
+from app.backup import PAGES_PER_STEP, STEP_PAUSE, Backup, run_backup
+from app.database import DATABASE_PATH
+from app.routes.orders import OrderCreate, OrderUpdate, create_order, update_order
+
+BLOB_SIZE = 1024 * 1024
+
+
+def pad_database(size_gb: float):
+    """Grow the database to roughly size_gb with 1 MB random blobs."""
+    conn = get_connection()
+    conn.execute("CREATE TABLE IF NOT EXISTS bench_padding (id INTEGER PRIMARY KEY, data BLOB)")
+    target = int(size_gb * 1024)
+    existing = conn.execute("SELECT COUNT(*) FROM bench_padding").fetchone()[0]
+    while existing < target:
+        batch = min(256, target - existing)
+        conn.execute(
+            "INSERT INTO bench_padding (data) "
+            "SELECT randomblob(?) FROM (WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < ?) SELECT x FROM n)",
+            (BLOB_SIZE, batch)
+        )
+        conn.commit()
+        existing += batch
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+
+
+class Writers:
+    """Writer threads recording per-request latency until stopped."""
+
+    def __init__(self, order_ids: list, n_updaters: int):
+        self.order_ids = order_ids
+        self.n_updaters = n_updaters
+        self.samples = []
+        self.errors = 0
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _timed(self, fn):
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            self.errors += 1
+            return
+        self.samples.append((time.perf_counter() - start) * 1000)
+
+    def _update_loop(self, seed: int):
+        rng = random.Random(seed)
+        while not self._stop.is_set():
+            order_id = rng.choice(self.order_ids)
+            self._timed(lambda: update_order(order_id, OrderUpdate(total_amount=round(rng.uniform(5, 500), 2))))
+            time.sleep(0.002)
+
+    def _create_loop(self):
+        # A single creator, since concurrent creates can race on order numbers
+        while not self._stop.is_set():
+            self._timed(lambda: create_order(OrderCreate(
+                customer={"name": "Backup Bench", "email": "bench@example.com"}, total_amount=42.0
+            )))
+            time.sleep(0.01)
+
+    def start(self):
+        self._threads = [threading.Thread(target=self._update_loop, args=(i,)) for i in range(self.n_updaters)]
+        self._threads.append(threading.Thread(target=self._create_loop))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+
+def measure(label: str, order_ids: list, n_updaters: int, action=None, seconds: float = 0):
+    """Run writers during action() (or for `seconds`) and print their latency."""
+    writers = Writers(order_ids, n_updaters)
+    writers.start()
+    time.sleep(0.5)
+    start = time.perf_counter()
+    result = action() if action else time.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    writers.stop()
+
+    p = percentiles(writers.samples)
+    print(
+        f"{label:<28} {elapsed:7.1f} s  writes {len(writers.samples):6d} ({len(writers.samples) / elapsed:6.1f}/s)  "
+        f"p50 {p['p50']:7.2f}  p95 {p['p95']:7.2f}  p99 {p['p99']:7.2f}  max {p['max']:8.2f} ms  errors {writers.errors}"
+    )
+    return result
+
+
+def backup_action(path: str, pages_per_step: int, pause: float, compress: bool):
+    def action():
+        backup = run_backup(Backup(path, pages_per_step, pause, compress))
+        info = backup.to_dict()
+        if info["status"] != "completed":
+            raise SystemExit(f"backup {info['status']}: {info['error']}")
+        print(
+            f"{'':<28} backup: {info['copied_mb']:.0f} MB at {info['mb_per_second']} MB/s in {info['steps']} steps, "
+            f"{info['restarts']} restarts, journal {info['journal_mode']}, output {info['output_bytes'] / 2**20:.0f} MB"
+        )
+        os.remove(path)
+    return action
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write latency during online backups")
+    parser.add_argument("--size-gb", type=float, default=2.0, help="Database size to pad to")
+    parser.add_argument("--orders", type=int, default=100_000, help="Number of orders to seed")
+    parser.add_argument("--writers", type=int, default=2, help="Threads running update_order")
+    parser.add_argument("--pages-per-step", type=int, default=PAGES_PER_STEP)
+    parser.add_argument("--pause", type=float, default=STEP_PAUSE)
+    parser.add_argument("--compress", action="store_true", help="Also gzip the backups")
+    parser.add_argument("--baseline-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    setup_database(args.orders)
+    pad_database(args.size_gb)
+    conn = get_connection()
+    order_ids = [row[0] for row in conn.execute("SELECT id FROM orders")]
+    conn.close()
+    print(f"\nDatabase: {DATABASE_PATH} ({os.path.getsize(DATABASE_PATH) / 2**30:.2f} GB, {len(order_ids)} orders)\n")
+
+    out = os.path.join(os.path.dirname(DATABASE_PATH), "bench-backup.db" + (".gz" if args.compress else ""))
+    measure("baseline (no backup)", order_ids, args.writers, seconds=args.baseline_seconds)
+    measure(
+        f"stepped ({args.pages_per_step} pages, {args.pause}s)", order_ids, args.writers,
+        backup_action(out, args.pages_per_step, args.pause, args.compress)
+    )
+    measure("one step (pages=-1)", order_ids, args.writers, backup_action(out, -1, 0.0, args.compress))
@@ -0,0 +1,65 @@
+"""
+Benchmark: batch read/patch vs. one request per order.
+
+Measures orders per second for N x GET /orders/{id} against POST
+/orders/batch-get, and N x PUT /orders/{id} against PATCH /orders/batch.
+
+Usage:
+    python benchmarks/bench_batch.py --orders 100000 --batch 2000
+"""
+
+import argparse
+import random
+import time
+
+from common import call_route, setup_database, get_connection
+
+from app.routes.orders import (
+    BatchGet,
+    BatchPatch,
+    OrderUpdate,
+    batch_get,
+    batch_patch,
+    get_order,
+    update_order,
+)
+
+
+def throughput(label: str, count: int, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms  {count / elapsed:10.0f} orders/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch endpoint benchmark")
+    parser.add_argument("--orders", type=int, default=100_000, help="Number of orders to seed")
+    parser.add_argument("--batch", type=int, default=2_000, help="Ids per batch")
+    args = parser.parse_args()
+
+    path = setup_database(args.orders)
+    conn = get_connection()
+    all_ids = [row["id"] for row in conn.execute("SELECT id FROM orders")]
+    conn.close()
+
+    rng = random.Random(7)
+    ids = rng.sample(all_ids, args.batch)
+    statuses = ["pending", "completed", "refunded"]
+    patches = [
+        {"id": order_id, "status": rng.choice(statuses), "total_amount": round(rng.uniform(5, 500), 2)}
+        if i % 2 else {"id": order_id, "payment_status": rng.choice(["paid", "unpaid"])}
+        for i, order_id in enumerate(ids)
+    ]
+
+    print(f"\nDatabase: {path} ({args.orders} orders, batch={args.batch})")
+    throughput("GET /orders/{id} x N", len(ids), lambda: [call_route(get_order, order_id=order_id) for order_id in ids])
+    throughput("POST /orders/batch-get", len(ids), lambda: batch_get(BatchGet(order_ids=ids)))
+
+    def individual_updates():
+        for patch in patches:
+            fields = dict(patch)
+            update_order(fields.pop("id"), OrderUpdate(**fields))
+
+    throughput("PUT /orders/{id} x N", len(patches), individual_updates)
+    throughput("PATCH /orders/batch", len(patches), lambda: batch_patch(BatchPatch(updates=patches)))
@@ -0,0 +1,39 @@
+"""
+Benchmark: GET /orders/dashboard vs. the separate requests it replaces.
+
+The frontend used to call /orders and /orders/stats, and tab badges would
+need one more /orders call per filter tab. Each of those opens its own
+connection; the dashboard answers everything from one read transaction.
+
+Usage:
+    python benchmarks/bench_dashboard.py --orders 200000
+"""
+
+import argparse
+
+from common import call_route, setup_database, timeit, report
+
+from app.routes.orders import STATUS_FILTERS, get_dashboard, get_order_stats, get_orders
+
+
+def multi_request_sequence():
+    call_route(get_orders, status="all", page=1, limit=10)
+    get_order_stats()
+    for tab in STATUS_FILTERS:
+        call_route(get_orders, status=tab, page=1, limit=1)
+
+
+def dashboard_request():
+    call_route(get_dashboard, status="all", page=1, limit=10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard endpoint benchmark")
+    parser.add_argument("--orders", type=int, default=100_000, help="Number of orders to seed")
+    parser.add_argument("--repeat", type=int, default=30, help="Iterations per scenario")
+    args = parser.parse_args()
+
+    path = setup_database(args.orders)
+    print(f"\nDatabase: {path} ({args.orders} orders)")
+    report("orders + stats + 5 tab counts", timeit(multi_request_sequence, args.repeat))
+    report("dashboard (single call)", timeit(dashboard_request, args.repeat))
@@ -0,0 +1,50 @@
+"""
+Benchmark: sparse fieldsets on GET /orders.
+
+Compares the default full-shape page against `fields=` projections, reporting
+serialized bytes per page and handler latency.
+
+Usage:
+    python benchmarks/bench_fields.py --orders 200000 --limit 100
+"""
+
+import argparse
+
+from common import call_route, setup_database, timeit, report
+
+from app.routes.orders import get_orders
+
+PROJECTIONS = [
+    None,
+    "id,status",
+    "id,order_number,status,payment_status",
+    "id,order_number,customer.name,order_date,status,total_amount,payment_status",
+]
+
+
+def page_bytes(response) -> int:
+    """Size of the JSON body the client would receive."""
+    if hasattr(response, "body"):
+        return len(response.body)
+    return len(response.model_dump_json())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sparse fieldset benchmark")
+    parser.add_argument("--orders", type=int, default=100_000, help="Number of orders to seed")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations per scenario")
+    args = parser.parse_args()
+
+    path = setup_database(args.orders)
+    print(f"\nDatabase: {path} ({args.orders} orders, limit={args.limit})")
+
+    for fields in PROJECTIONS:
+        for status in ("all", "finished"):
+            def run(fields=fields, status=status):
+                return call_route(get_orders, status=status, page=50, limit=args.limit, fields=fields)
+
+            size = page_bytes(run())
+            label = f"{status:<8} fields={fields or '(default)'}"
+            report(f"{label[:40]}", timeit(run, args.repeat))
+            print(f"{'':<40} {size} bytes/page")
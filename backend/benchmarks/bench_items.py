@@ -0,0 +1,78 @@
+"""
+Benchmark: items API at a million rows.
+
+Covers keyset pagination deep into the table (vs. the equivalent OFFSET
+query), cached vs. uncached get_item, and bulk create/update/delete.
+
+Usage:
+    python benchmarks/bench_items.py --items 1000000
+"""
+
+import argparse
+import random
+import time
+
+from common import get_connection, report, seed_items, timeit
+
+from app.routes.items import (
+    ItemBulkCreate,
+    ItemBulkDelete,
+    ItemBulkUpdate,
+    bulk_create_items,
+    bulk_delete_items,
+    bulk_update_items,
+    get_item,
+    item_cache,
+    list_items,
+)
+
+
+def offset_page(offset: int, limit: int):
+    """The pre-keyset way of reaching a deep page, for comparison."""
+    conn = get_connection()
+    rows = conn.execute("SELECT id, name FROM items ORDER BY id LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+    conn.close()
+    return rows
+
+
+def throughput(label: str, count: int, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms  {count / elapsed:10.0f} items/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Items API benchmark")
+    parser.add_argument("--items", type=int, default=1_000_000, help="Number of items to seed")
+    parser.add_argument("--bulk", type=int, default=10_000, help="Items per bulk operation")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per latency scenario")
+    args = parser.parse_args()
+
+    path = seed_items(args.items)
+    print(f"\nDatabase: {path} ({args.items} items)")
+
+    deep = args.items - 1_000
+    report("keyset page near the end", timeit(lambda: list_items(after_id=deep, limit=100), args.repeat // 10))
+    report("OFFSET page near the end", timeit(lambda: offset_page(deep, 100), args.repeat // 10))
+
+    rng = random.Random(3)
+    hot_ids = [rng.randint(1, args.items) for _ in range(100)]
+    item_cache.clear()
+    report("get_item (cold cache)", timeit(lambda: get_item(rng.randint(1, args.items)), args.repeat, warmup=0))
+    print(f"cache hits={item_cache.hits} misses={item_cache.misses} size={len(item_cache)}")
+
+    # Load the whole hot set first, so the timed calls measure the cached path
+    for item_id in hot_ids:
+        get_item(item_id)
+    item_cache.hits = item_cache.misses = 0
+    report("get_item (hot set of 100)", timeit(lambda: get_item(rng.choice(hot_ids)), args.repeat))
+    print(f"cache hits={item_cache.hits} misses={item_cache.misses} size={len(item_cache)}")
+
+    created = {}
+    names = [{"name": f"bulk-{i}"} for i in range(args.bulk)]
+    throughput("bulk create", args.bulk, lambda: created.update(bulk_create_items(ItemBulkCreate(items=names))))
+    new_ids = [item["id"] for item in created["items"]]
+    renames = [{"id": item_id, "name": f"renamed-{item_id}"} for item_id in new_ids]
+    throughput("bulk update", args.bulk, lambda: bulk_update_items(ItemBulkUpdate(items=renames)))
+    throughput("bulk delete", args.bulk, lambda: bulk_delete_items(ItemBulkDelete(ids=new_ids)))
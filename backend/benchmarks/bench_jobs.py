@@ -0,0 +1,111 @@
+"""
+Benchmark: other writers' latency while a very large bulk status update runs.
+
+Runs PUT /orders/bulk/status over many ids synchronously and then as a
+background job, while a second thread keeps issuing single-order updates
+and records their latency. Also simulates a restart part-way through a job
+and checks that it resumes without skipping or repeating ids.
+
+Usage:
+    python benchmarks/bench_jobs.py --orders 300000 --ids 200000
+"""
+
+import argparse
+import threading
+import time
+
+from common import call_route, get_connection, percentiles, setup_database
+
+from app import jobs
+from app.routes.orders import BulkStatusUpdate, OrderUpdate, bulk_update_status, update_order
+
+
+def measure_writers(ids, run):
+    """Run `run` while a writer thread updates orders; return writer latencies in ms."""
+    latencies, errors = [], []
+    done = threading.Event()
+
+    def writer():
+        i = 0
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                update_order(ids[i % len(ids)], OrderUpdate(total_amount=float(i % 500)))
+                latencies.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                errors.append(str(e))
+            i += 1
+            time.sleep(0.002)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    done.set()
+    thread.join()
+    return elapsed, latencies, errors
+
+
+def wait_for(job_id):
+    while jobs.get_job(job_id, results_limit=1)["status"] in jobs.ACTIVE_STATUSES:
+        time.sleep(0.05)
+
+
+def print_result(label, elapsed, latencies, errors):
+    p = percentiles(latencies)
+    print(
+        f"{label:<22} bulk {elapsed:6.1f} s | writers {len(latencies):5d} ok, {len(errors):4d} failed, "
+        f"p50 {p['p50']:8.1f} ms  p99 {p['p99']:8.1f} ms  max {p['max']:8.1f} ms"
+    )
+    if errors:
+        print(f"{'':<22} e.g. {errors[0]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Background bulk job benchmark")
+    parser.add_argument("--orders", type=int, default=300_000, help="Number of orders to seed")
+    parser.add_argument("--ids", type=int, default=200_000, help="Ids in the bulk operation")
+    args = parser.parse_args()
+
+    path = setup_database(args.orders)
+    conn = get_connection()
+    ids = [row["id"] for row in conn.execute("SELECT id FROM orders LIMIT ?", (args.ids,))]
+    conn.close()
+    writer_ids = ids[:1000]
+    print(f"\nDatabase: {path} ({args.orders} orders, {len(ids)} ids per bulk operation)")
+
+    print_result("synchronous", *measure_writers(
+        writer_ids, lambda: call_route(bulk_update_status, data=BulkStatusUpdate(order_ids=ids, status="completed"))
+    ))
+
+    def background():
+        job = jobs.create_job("bulk_status", ids, {"status": "refunded"})
+        wait_for(job["job_id"])
+
+    jobs.worker.start()
+    print_result("background job", *measure_writers(writer_ids, background))
+    jobs.worker.stop()
+
+    # Restart: process a few chunks, then let a fresh worker pick the job up
+    job_id = jobs.create_job("bulk_status", ids, {"status": "pending"})["job_id"]
+    for _ in range(5):
+        jobs.run_next_chunk(job_id)
+    before = jobs.get_job(job_id, results_limit=1)["processed"]
+    restarted = jobs.JobWorker()
+    restarted.start()
+    wait_for(job_id)
+    restarted.stop()
+    job = jobs.get_job(job_id, results_limit=1)
+
+    conn = get_connection()
+    pending = conn.execute(
+        "SELECT COUNT(*) FROM orders WHERE status = 'pending' AND id IN (SELECT order_id FROM bulk_job_items WHERE job_id = ?)",
+        (job_id,)
+    ).fetchone()[0]
+    conn.close()
+    print(
+        f"\nrestart: {before} ids done before restart, job {job['status']} with "
+        f"processed={job['processed']} succeeded={job['succeeded']} total={job['total']}, "
+        f"{pending} orders now pending"
+    )
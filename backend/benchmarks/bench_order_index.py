@@ -0,0 +1,168 @@
+"""
+Benchmark and consistency check for the in-memory order index.
+
+1. Loads the index and reports load time plus memory per million orders,
+   both measured (tracemalloc) and as estimated by memory_report().
+2. Checks that list pages, keyset pages, sparse fieldsets, single lookups,
+   stats and the dashboard answered from memory match the SQLite answers.
+3. Times those reads from SQLite and from memory.
+4. Runs a mixed write workload through the routes (single, bulk, batch and
+   background-job writes) and verifies the index with check().
+
+Usage:
+    python benchmarks/bench_order_index.py --orders 1000000
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from common import call_route, get_connection, setup_database, timeit, report
+
+from app import jobs
+from app.order_index import order_index
+from app.routes.orders import (
+    STATUS_FILTERS, BatchPatch, BulkDelete, BulkDuplicate, BulkStatusUpdate, OrderCreate, OrderUpdate,
+    batch_patch, bulk_delete, bulk_duplicate, bulk_update_status, create_order, delete_order,
+    get_dashboard, get_order, get_order_stats, get_orders, update_order,
+)
+
+
+def dump(result):
+    if hasattr(result, "body"):
+        return json.loads(result.body)
+    return result.model_dump()
+
+
+def both(fn):
+    """Return fn's result from SQLite and from the index."""
+    order_index.loaded = False
+    from_sql = dump(fn())
+    order_index.loaded = True
+    return from_sql, dump(fn())
+
+
+def check_reads(sample_ids):
+    cases = []
+    for tab in STATUS_FILTERS:
+        for sort_dir in ("desc", "asc"):
+            for page in (1, 2, 50):
+                cases.append(dict(status=tab, sort_dir=sort_dir, page=page, limit=10))
+    cases.append(dict(status="ongoing", page=3, limit=25, fields="id,order_number,customer.name"))
+
+    mismatches = 0
+    for params in cases:
+        from_sql, from_memory = both(lambda: call_route(get_orders, **params))
+        mismatches += from_sql != from_memory
+        # Follow the keyset token for a few pages as well
+        after = from_sql.get("next_after")
+        for _ in range(3):
+            if not after:
+                break
+            keyset = {**params, "after": after}
+            from_sql, from_memory = both(lambda: call_route(get_orders, **keyset))
+            mismatches += from_sql != from_memory
+            after = from_sql.get("next_after")
+
+    for order_id in sample_ids:
+        from_sql, from_memory = both(lambda: call_route(get_order, order_id=order_id))
+        mismatches += from_sql != from_memory
+    for tab in STATUS_FILTERS:
+        from_sql, from_memory = both(lambda: call_route(get_dashboard, status=tab, page=2, limit=10))
+        mismatches += from_sql != from_memory
+    from_sql, from_memory = both(get_order_stats)
+    mismatches += from_sql != from_memory
+    return mismatches
+
+
+def random_writes(rng: random.Random, ids: list, rounds: int):
+    """Drive every write path that refreshes the index."""
+    for _ in range(rounds):
+        picked = rng.sample(ids, 5)
+        created = create_order(OrderCreate(
+            customer={"name": "Index Check", "email": "index@example.com"},
+            total_amount=round(rng.uniform(5, 500), 2),
+            status=rng.choice(["pending", "completed", "refunded"]),
+            payment_status=rng.choice(["paid", "unpaid"]),
+        ))
+        ids.append(created.id)
+        update_order(picked[0], OrderUpdate(status=rng.choice(["pending", "completed"]), payment_status="paid"))
+        call_route(bulk_update_status, data=BulkStatusUpdate(order_ids=picked[1:3], status="refunded"))
+        duplicated = call_route(bulk_duplicate, data=BulkDuplicate(order_ids=picked[3:5]))
+        ids.extend(order["id"] for order in duplicated["new_orders"])
+        batch_patch(BatchPatch(updates=[{"id": picked[1], "payment_status": "unpaid", "status": "pending"}]))
+        call_route(bulk_delete, data=BulkDelete(order_ids=[picked[2]]))
+        delete_order(picked[4])
+        for order_id in (picked[2], picked[4]):
+            ids.remove(order_id)
+
+    # One background job, processed chunk by chunk as the worker would
+    job = jobs.create_job("bulk_status", rng.sample(ids, 1200), {"status": "pending"})
+    while jobs.run_next_chunk(job["job_id"]):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-memory order index benchmark")
+    parser.add_argument("--orders", type=int, default=200_000, help="Number of orders to seed")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per timed scenario")
+    parser.add_argument("--writes", type=int, default=200, help="Rounds of mixed writes before the consistency check")
+    args = parser.parse_args()
+
+    path = setup_database(args.orders)
+    print(f"\nDatabase: {path} ({args.orders} orders)")
+
+    start = time.perf_counter()
+    order_index.load()
+    load_seconds = time.perf_counter() - start
+
+    # Measure a second load separately, as tracemalloc slows loading down a lot
+    tracemalloc.start()
+    order_index.load()
+    measured, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    estimate = order_index.memory_report()
+    print(f"load: {load_seconds:.2f} s for {estimate['orders']} orders")
+    print(f"memory (tracemalloc): {measured / 2**20:.1f} MB = {measured / estimate['orders']:.0f} B/order "
+          f"= {measured / estimate['orders'] * 1_000_000 / 2**20:.0f} MB per million orders")
+    print(f"memory (memory_report estimate): {estimate['bytes_per_order']} B/order "
+          f"= {estimate['mb_per_million_orders']:.0f} MB per million orders")
+
+    rng = random.Random(7)
+    conn = get_connection()
+    ids = [row[0] for row in conn.execute("SELECT id FROM orders")]
+    conn.close()
+    mismatches = check_reads(rng.sample(ids, 50))
+    print(f"\nread parity (SQLite vs memory): {'OK' if not mismatches else f'{mismatches} MISMATCHES'}")
+
+    deep_page = max(1, order_index.counts()["total"] // 10 // 2)
+    order_id = rng.choice(ids)
+    scenarios = [
+        ("GET /orders page 1", lambda: call_route(get_orders, status="all", page=1, limit=10)),
+        ("GET /orders?status=ongoing page 1", lambda: call_route(get_orders, status="ongoing", page=1, limit=10)),
+        (f"GET /orders page {deep_page}", lambda: call_route(get_orders, status="all", page=deep_page, limit=10)),
+        ("GET /orders/stats", get_order_stats),
+        ("GET /orders/{id}", lambda: call_route(get_order, order_id=order_id)),
+        ("GET /orders/dashboard", lambda: call_route(get_dashboard)),
+    ]
+    print()
+    for label, fn in scenarios:
+        order_index.loaded = False
+        report(f"{label} [sqlite]", timeit(fn, max(5, args.repeat // 20)))
+        order_index.loaded = True
+        report(f"{label} [memory]", timeit(fn, args.repeat))
+
+    start = time.perf_counter()
+    random_writes(rng, ids, args.writes)
+    print(f"\n{args.writes} rounds of mixed writes + a 1200-id background job in {time.perf_counter() - start:.2f} s")
+    result = order_index.check(STATUS_FILTERS)
+    print(f"consistency check: {'OK' if result['consistent'] else 'FAILED'} "
+          f"({result['orders_checked']} orders checked)")
+    if not result["consistent"]:
+        print(json.dumps(result, indent=2))
+        raise SystemExit(1)
+    if mismatches or check_reads(rng.sample(ids, 50)):
+        raise SystemExit("read parity failed")
@@ -0,0 +1,181 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Each benchmark runs against a throwaway SQLite database, so DATABASE_PATH is
+pointed at a temp file before anything from the app package is imported.
+"""
+
+import os
+import sys
+import inspect
+import json
+import tempfile
+import time
+import random
+import statistics
+import uuid
+from typing import Optional
+
+from pydantic.fields import FieldInfo
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+if "DATABASE_PATH" not in os.environ:
+    os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="orders-bench-"), "bench.db")
+
+from app.database import DATABASE_PATH, get_connection  # noqa: E402
+from migrate import run_migrations  # noqa: E402
+
+STATUSES = ["pending", "completed", "refunded"]
+PAYMENT_STATUSES = ["paid", "unpaid"]
+
+
+def setup_database(n_orders: int, seed: int = 42):
+    """Apply migrations and top the orders table up to n_orders synthetic rows."""
+    run_migrations("upgrade")
+    rng = random.Random(seed)
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM orders")
+    existing = cursor.fetchone()[0]
+    now = datetime.utcnow().isoformat()
+    start = date(2020, 1, 1)
+
+    batch = []
+    for i in range(existing, n_orders):
+        name = f"Customer {rng.randint(1, 50_000)}"
+        batch.append((
+            str(uuid.uuid4()),
+            f"#ORD{100_000 + i}",
+            name,
+            f"{name.replace(' ', '.').lower()}@example.com",
+            f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=3b82f6&color=fff&size=40&bold=true",
+            (start + timedelta(days=rng.randint(0, 5 * 365))).isoformat(),
+            rng.choice(STATUSES),
+            round(rng.uniform(5, 2000), 2),
+            rng.choice(PAYMENT_STATUSES),
+            now,
+            now,
+        ))
+        if len(batch) >= 10_000:
+            _insert_orders(cursor, batch)
+            batch = []
+    if batch:
+        _insert_orders(cursor, batch)
+
+    conn.commit()
+    conn.close()
+    return DATABASE_PATH
+
+
+def seed_items(n_items: int):
+    """Apply migrations and top the items table up to n_items rows."""
+    run_migrations("upgrade")
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM items")
+    existing = cursor.fetchone()[0]
+    for start in range(existing, n_items, 50_000):
+        cursor.executemany(
+            "INSERT INTO items (name) VALUES (?)",
+            ((f"item-{i}",) for i in range(start, min(start + 50_000, n_items)))
+        )
+    conn.commit()
+    conn.close()
+    return DATABASE_PATH
+
+
+def _insert_orders(cursor, rows):
+    cursor.executemany("""
+        INSERT INTO orders (id, order_number, customer_name, customer_email, customer_avatar, order_date, status, total_amount, payment_status, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+
+
+def call_route(route, **kwargs):
+    """Call a route handler directly, filling omitted Query(...) params with their defaults."""
+    for name, param in inspect.signature(route).parameters.items():
+        if name not in kwargs and isinstance(param.default, FieldInfo):
+            kwargs[name] = param.default.get_default()
+    return route(**kwargs)
+
+
+def timeit(fn, repeat: int = 50, warmup: int = 3):
+    """Run fn repeatedly and return latency percentiles in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "mean": statistics.fmean(samples),
+        "p50": samples[len(samples) // 2],
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max": samples[-1],
+    }
+
+
+def percentiles(samples) -> dict:
+    """p50/p95/p99/max of a list of latencies, in the same unit."""
+    samples = sorted(samples)
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    def pick(q):
+        return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": samples[-1]}
+
+
+async def asgi_request(app, method: str, path: str, body: Optional[dict] = None) -> int:
+    """Send one HTTP request straight into an ASGI app and return the status code."""
+    path, _, query = path.partition("?")
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # Starlette has already sent a 500 before re-raising, as under uvicorn
+        return status or 500
+    return status
+
+
+def report(label: str, result: dict):
+    """Print one benchmark line."""
+    print(
+        f"{label:<40} mean {result['mean']:8.2f} ms  p50 {result['p50']:8.2f} ms  "
+        f"p95 {result['p95']:8.2f} ms  max {result['max']:8.2f} ms"
+    )
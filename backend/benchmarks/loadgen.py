@@ -0,0 +1,452 @@
+"""
+End-to-end load generator replaying the dashboard's traffic pattern.
+
+Starts the API under uvicorn (or targets a running server with --url) and
+drives it with concurrent virtual users that behave like frontend/app/page.tsx:
+
+- browse:    change tab/page -> GET /orders and GET /orders/stats in parallel
+- duplicate: POST /orders/bulk/duplicate, then GET /orders, then GET /orders/stats
+- bulk delete: DELETE /orders/bulk, then GET /orders, then GET /orders/stats
+- delete:    DELETE /orders/{id}, then GET /orders, then GET /orders/stats
+
+On top of that, a steady open-loop stream of POST /orders creates runs.
+The report covers throughput, latency percentiles and error rates per route,
+503 sheds, server exceptions such as `database is locked` (from the server log) and
+server CPU/RSS sampled over time from /proc.
+
+Usage:
+    python benchmarks/loadgen.py --orders 100000 --users 50 --duration 60
+    python benchmarks/loadgen.py --url http://127.0.0.1:8000 --users 20 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import urlparse
+
+from common import BACKEND_DIR, percentiles, setup_database
+
+TABS = ["all", "incomplete", "overdue", "ongoing", "finished"]
+
+# Relative weights of the user actions between page views
+DEFAULT_MIX = {"browse": 70, "duplicate": 10, "bulk_delete": 5, "delete": 15}
+
+
+class HttpClient:
+    """Minimal keep-alive HTTP/1.1 client on asyncio streams (JSON bodies only)."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def close(self):
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, body: Optional[dict] = None):
+        """Send a request and return (status, body bytes). Reconnects once on a dropped connection."""
+        for attempt in (1, 2):
+            try:
+                if self._writer is None:
+                    self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                return await self._roundtrip(method, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if attempt == 2:
+                    raise
+
+    async def _roundtrip(self, method, path, body):
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+        )
+        self._writer.write(head.encode() + payload)
+        await self._writer.drain()
+
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            data = await self._reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            data = b""
+            while True:
+                size = int((await self._reader.readuntil(b"\r\n")).strip(), 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                data += chunk[:-2]
+        else:
+            data = b""
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, data
+
+
+class Stats:
+    """Per-route latency samples and outcome counts."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.transport_errors = defaultdict(int)
+
+    def record(self, route: str, status: Optional[int], elapsed_ms: float):
+        if status is None:
+            self.transport_errors[route] += 1
+            return
+        self.latencies[route].append(elapsed_ms)
+        self.statuses[route][status] += 1
+
+
+class VirtualUser:
+    """One simulated dashboard session, keeping its own connections like a browser tab."""
+
+    def __init__(self, host, port, stats: Stats, rng: random.Random, mix: dict, think: float):
+        # Two connections, so the parallel orders+stats fetch really is parallel
+        self.clients = [HttpClient(host, port), HttpClient(host, port)]
+        self.stats = stats
+        self.rng = rng
+        self.actions = list(mix)
+        self.weights = [mix[action] for action in self.actions]
+        self.think = think
+        self.tab = "all"
+        self.page = 1
+        self.total_pages = 1
+        self.visible_ids = []
+
+    async def call(self, route: str, method: str, path: str, body=None, client: int = 0):
+        start = time.perf_counter()
+        try:
+            status, data = await self.clients[client].request(method, path, body)
+        except (OSError, asyncio.IncompleteReadError):
+            self.stats.record(route, None, 0.0)
+            return None, b""
+        self.stats.record(route, status, (time.perf_counter() - start) * 1000)
+        return status, data
+
+    async def fetch_orders(self, client: int = 0):
+        status, data = await self.call(
+            "GET /orders", "GET", f"/orders?status={self.tab}&page={self.page}&limit=10", client=client
+        )
+        if status == 200:
+            page = json.loads(data)
+            self.visible_ids = [order["id"] for order in page["orders"]]
+            self.total_pages = page["total_pages"]
+
+    async def fetch_stats(self, client: int = 0):
+        await self.call("GET /orders/stats", "GET", "/orders/stats", client=client)
+
+    async def load(self):
+        # useEffect: Promise.all([fetchOrders(), fetchStats()])
+        await asyncio.gather(self.fetch_orders(0), self.fetch_stats(1))
+
+    async def refresh(self):
+        # After a mutation the page awaits fetchOrders() then fetchStats()
+        await self.fetch_orders()
+        await self.fetch_stats()
+
+    def selection(self):
+        if not self.visible_ids:
+            return []
+        return self.rng.sample(self.visible_ids, self.rng.randint(1, min(5, len(self.visible_ids))))
+
+    async def run(self, deadline: float):
+        await self.load()
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think) if self.think else 0)
+            action = self.rng.choices(self.actions, self.weights)[0]
+
+            if action == "browse":
+                if self.rng.random() < 0.3:
+                    self.tab, self.page = self.rng.choice(TABS), 1
+                else:
+                    self.page = self.rng.randint(1, max(1, min(self.total_pages, 20)))
+                await self.load()
+                continue
+
+            ids = self.selection()
+            if not ids:
+                await self.load()
+                continue
+
+            if action == "duplicate":
+                status, _ = await self.call("POST /orders/bulk/duplicate", "POST", "/orders/bulk/duplicate", {"order_ids": ids})
+            elif action == "bulk_delete":
+                status, _ = await self.call("DELETE /orders/bulk", "DELETE", "/orders/bulk", {"order_ids": ids})
+            else:
+                status, _ = await self.call("DELETE /orders/{id}", "DELETE", f"/orders/{ids[0]}")
+
+            # page.tsx only refreshes when response.ok
+            if status is not None and 200 <= status < 300:
+                await self.refresh()
+
+        for client in self.clients:
+            await client.close()
+
+
+async def creator(host, port, stats: Stats, rate: float, deadline: float, rng: random.Random):
+    """Open-loop stream of POST /orders at a steady rate, independent of response times."""
+    if rate <= 0:
+        return
+    # Idle keep-alive connections; a new one is opened whenever all are busy
+    idle: list = []
+    pending = set()
+
+    async def create():
+        conn = idle.pop() if idle else HttpClient(host, port)
+        body = {
+            "customer": {"name": f"Load User {rng.randint(1, 10_000)}", "email": "load@example.com"},
+            "total_amount": round(rng.uniform(5, 500), 2),
+            "status": rng.choice(["pending", "completed"]),
+            "payment_status": rng.choice(["paid", "unpaid"]),
+        }
+        start = time.perf_counter()
+        try:
+            status, _ = await conn.request("POST", "/orders", body)
+        except (OSError, asyncio.IncompleteReadError):
+            stats.record("POST /orders", None, 0.0)
+            await conn.close()
+            return
+        stats.record("POST /orders", status, (time.perf_counter() - start) * 1000)
+        idle.append(conn)
+
+    next_at = time.perf_counter()
+    while next_at < deadline:
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        task = asyncio.create_task(create())
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        next_at += 1 / rate
+
+    await asyncio.gather(*pending)
+    for conn in idle:
+        await conn.close()
+
+
+class ResourceSampler:
+    """Samples CPU% and RSS of a server process tree from /proc (Linux only)."""
+
+    def __init__(self, pid: int, interval: float):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self.ticks = os.sysconf("SC_CLK_TCK")
+
+    def _pids(self):
+        pids = [self.pid]
+        try:
+            with open(f"/proc/{self.pid}/task/{self.pid}/children") as f:
+                pids += [int(child) for child in f.read().split()]
+        except OSError:
+            pass
+        return pids
+
+    def _read(self):
+        cpu_ticks, rss_kb = 0, 0
+        for pid in self._pids():
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                cpu_ticks += int(fields[11]) + int(fields[12])
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            rss_kb += int(line.split()[1])
+            except (OSError, IndexError):
+                continue
+        return cpu_ticks, rss_kb
+
+    async def run(self, deadline: float):
+        if not os.path.exists(f"/proc/{self.pid}/stat"):
+            return
+        start = time.perf_counter()
+        last_ticks, _ = self._read()
+        last_time = start
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self.interval)
+            ticks, rss_kb = self._read()
+            now = time.perf_counter()
+            cpu = (ticks - last_ticks) / self.ticks / (now - last_time) * 100
+            self.samples.append({"t": round(now - start, 1), "cpu_percent": round(cpu, 1), "rss_mb": round(rss_kb / 1024, 1)})
+            last_ticks, last_time = ticks, now
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, log_path: str) -> subprocess.Popen:
+    """Launch uvicorn on the benchmark database and wait for /health."""
+    log = open(log_path, "w")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ),
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited early, see {log_path}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5) as sock:
+                sock.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                if b"200" in sock.recv(64):
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+def server_exceptions(log_path: str) -> dict:
+    """Count the final exception line of each traceback in the server log."""
+    counts = defaultdict(int)
+    with open(log_path) as f:
+        for line in f:
+            if re.match(r"^[A-Za-z_][\w.]*(Error|Exception): ", line):
+                counts[line.strip()[:120]] += 1
+    return dict(counts)
+
+
+def print_report(stats: Stats, elapsed: float, samples: list, exceptions: Optional[dict]):
+    print(f"\n{'route':<30} {'reqs':>7} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'5xx':>6} {'503':>6} {'4xx':>6} {'conn':>5}")
+    print("-" * 112)
+    total = errors = 0
+    for route in sorted(set(stats.latencies) | set(stats.transport_errors)):
+        samples_ms = stats.latencies[route]
+        codes = stats.statuses[route]
+        p = percentiles(samples_ms)
+        shed = codes.get(503, 0)
+        server_errors = sum(n for code, n in codes.items() if code >= 500) - shed
+        client_errors = sum(n for code, n in codes.items() if 400 <= code < 500)
+        conn_errors = stats.transport_errors[route]
+        count = len(samples_ms) + conn_errors
+        total += count
+        errors += server_errors + shed + conn_errors
+        print(
+            f"{route:<30} {count:7d} {count / elapsed:7.1f} {p['p50']:8.1f} {p['p95']:8.1f} {p['p99']:8.1f} "
+            f"{p['max']:8.1f} {server_errors:6d} {shed:6d} {client_errors:6d} {conn_errors:5d}"
+        )
+    print("-" * 112)
+    print(f"total {total} requests in {elapsed:.1f} s = {total / elapsed:.1f} req/s, "
+          f"error rate {errors / total * 100 if total else 0:.2f}% (5xx + 503 + connection errors; latencies in ms)")
+    if exceptions is not None:
+        locked = sum(n for message, n in exceptions.items() if "database is locked" in message)
+        print(f"'database is locked' errors in server log: {locked}")
+        for message, n in sorted(exceptions.items(), key=lambda item: -item[1]):
+            print(f"  {n:6d}  {message}")
+
+    if samples:
+        print(f"\n{'t (s)':>6} {'cpu %':>7} {'rss MB':>8}")
+        for sample in samples:
+            print(f"{sample['t']:6.1f} {sample['cpu_percent']:7.1f} {sample['rss_mb']:8.1f}")
+
+
+async def main(args):
+    mix = dict(DEFAULT_MIX)
+    for item in args.mix.split(",") if args.mix else []:
+        action, _, weight = item.partition("=")
+        if action not in mix:
+            raise SystemExit(f"Unknown action in --mix: {action}")
+        mix[action] = float(weight)
+
+    server, log_path = None, None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+    else:
+        setup_database(args.orders)
+        host, port = "127.0.0.1", free_port()
+        log_path = os.path.join(tempfile.mkdtemp(prefix="loadgen-"), "server.log")
+        server = start_server(port, args.workers, log_path)
+        print(f"uvicorn pid {server.pid} on port {port}, log {log_path}")
+
+    stats = Stats()
+    rng = random.Random(args.seed)
+    try:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        users = [
+            VirtualUser(host, port, stats, random.Random(rng.random()), mix, args.think_ms / 1000)
+            for _ in range(args.users)
+        ]
+        sampler = ResourceSampler(server.pid, args.sample_interval) if server else None
+        tasks = [user.run(deadline) for user in users]
+        tasks.append(creator(host, port, stats, args.create_rate, deadline, random.Random(rng.random())))
+        if sampler:
+            tasks.append(sampler.run(deadline))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    finally:
+        if server:
+            server.send_signal(signal.SIGINT)
+            try:
+                server.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    exceptions = server_exceptions(log_path) if log_path else None
+    print_report(stats, elapsed, sampler.samples if sampler else [], exceptions)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "elapsed": elapsed,
+                "routes": {
+                    route: {"count": len(values), **percentiles(values), "statuses": dict(stats.statuses[route]),
+                            "connection_errors": stats.transport_errors[route]}
+                    for route, values in stats.latencies.items()
+                },
+                "server_exceptions": exceptions,
+                "resources": sampler.samples if sampler else [],
+            }, f, indent=2)
+        print(f"\nJSON report written to {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard traffic load generator")
+    parser.add_argument("--url", help="Target a running server instead of starting uvicorn")
+    parser.add_argument("--orders", type=int, default=50_000, help="Orders to seed when starting the server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Test duration in seconds")
+    parser.add_argument("--think-ms", type=float, default=500, help="Mean think time between user actions")
+    parser.add_argument("--create-rate", type=float, default=5, help="Steady POST /orders per second")
+    parser.add_argument("--mix", help="Override action weights, e.g. browse=60,duplicate=20,bulk_delete=5,delete=15")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between CPU/RSS samples")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--json", help="Also write the report as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
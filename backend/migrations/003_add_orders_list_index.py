@@ -0,0 +1,83 @@
+"""
+Migration: Add covering index for order list projections
+Version: 003
+Description: Adds an index holding the filter tab columns and id in order_number
+order, so sparse-fieldset pages (e.g. fields=id,status) and tab counts are
+answered from the index without touching the table rows
+"""
+
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import DATABASE_PATH
+
+
+def upgrade():
+    """Apply the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    # Create migrations tracking table if it doesn't exist
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS _migrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Check if this migration has already been applied
+    cursor.execute("SELECT 1 FROM _migrations WHERE name = ?", ("003_add_orders_list_index",))
+    if cursor.fetchone():
+        print("Migration 003_add_orders_list_index already applied. Skipping.")
+        conn.close()
+        return
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_orders_list
+        ON orders (order_number, status, payment_status, id)
+    """)
+
+    # Record this migration
+    cursor.execute("INSERT INTO _migrations (name) VALUES (?)", ("003_add_orders_list_index",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 003_add_orders_list_index applied successfully.")
+
+
+def downgrade():
+    """Revert the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute("DROP INDEX IF EXISTS idx_orders_list")
+
+    # Remove migration record
+    cursor.execute("DELETE FROM _migrations WHERE name = ?", ("003_add_orders_list_index",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 003_add_orders_list_index reverted successfully.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run database migration")
+    parser.add_argument(
+        "action",
+        choices=["upgrade", "downgrade"],
+        help="Migration action to perform"
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "upgrade":
+        upgrade()
+    elif args.action == "downgrade":
+        downgrade()
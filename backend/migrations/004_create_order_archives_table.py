@@ -0,0 +1,90 @@
+"""
+Migration: Create order archives catalog
+Version: 004
+Description: Creates the order_archives table listing the per-month archive
+databases that old terminal orders are moved into (see app/archive.py)
+"""
+
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import DATABASE_PATH
+
+
+def upgrade():
+    """Apply the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    # Create migrations tracking table if it doesn't exist
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS _migrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Check if this migration has already been applied
+    cursor.execute("SELECT 1 FROM _migrations WHERE name = ?", ("004_create_order_archives_table",))
+    if cursor.fetchone():
+        print("Migration 004_create_order_archives_table already applied. Skipping.")
+        conn.close()
+        return
+
+    # One row per archived month; max_order_seq keeps order numbers unique
+    # even after the newest archived orders have left the hot table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS order_archives (
+            period TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            max_order_seq INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL
+        )
+    """)
+
+    # Record this migration
+    cursor.execute("INSERT INTO _migrations (name) VALUES (?)", ("004_create_order_archives_table",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 004_create_order_archives_table applied successfully.")
+
+
+def downgrade():
+    """Revert the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    # Archive files are left on disk; only the catalog is dropped
+    cursor.execute("DROP TABLE IF EXISTS order_archives")
+
+    # Remove migration record
+    cursor.execute("DELETE FROM _migrations WHERE name = ?", ("004_create_order_archives_table",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 004_create_order_archives_table reverted successfully.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run database migration")
+    parser.add_argument(
+        "action",
+        choices=["upgrade", "downgrade"],
+        help="Migration action to perform"
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "upgrade":
+        upgrade()
+    elif args.action == "downgrade":
+        downgrade()
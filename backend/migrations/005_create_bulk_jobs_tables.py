@@ -0,0 +1,111 @@
+"""
+Migration: Create bulk jobs tables
+Version: 005
+Description: Creates bulk_jobs (job state and progress) and bulk_job_items
+(ids to process and per-item results) for background bulk operations
+"""
+
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import DATABASE_PATH
+
+
+def upgrade():
+    """Apply the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    # Create migrations tracking table if it doesn't exist
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS _migrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Check if this migration has already been applied
+    cursor.execute("SELECT 1 FROM _migrations WHERE name = ?", ("005_create_bulk_jobs_tables",))
+    if cursor.fetchone():
+        print("Migration 005_create_bulk_jobs_tables already applied. Skipping.")
+        conn.close()
+        return
+
+    # Status: queued, running, completed, cancelled or failed
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bulk_jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL CHECK(status IN ('queued', 'running', 'completed', 'cancelled', 'failed')),
+            params TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            processed INTEGER NOT NULL DEFAULT 0,
+            succeeded INTEGER NOT NULL DEFAULT 0,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bulk_jobs_status
+        ON bulk_jobs (status, created_at)
+    """)
+
+    # seq is the 1-based position within the job; result is NULL until processed
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bulk_job_items (
+            job_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            order_id TEXT NOT NULL,
+            result TEXT,
+            PRIMARY KEY (job_id, seq)
+        ) WITHOUT ROWID
+    """)
+
+    # Record this migration
+    cursor.execute("INSERT INTO _migrations (name) VALUES (?)", ("005_create_bulk_jobs_tables",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 005_create_bulk_jobs_tables applied successfully.")
+
+
+def downgrade():
+    """Revert the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute("DROP TABLE IF EXISTS bulk_job_items")
+    cursor.execute("DROP TABLE IF EXISTS bulk_jobs")
+
+    # Remove migration record
+    cursor.execute("DELETE FROM _migrations WHERE name = ?", ("005_create_bulk_jobs_tables",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 005_create_bulk_jobs_tables reverted successfully.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run database migration")
+    parser.add_argument(
+        "action",
+        choices=["upgrade", "downgrade"],
+        help="Migration action to perform"
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "upgrade":
+        upgrade()
+    elif args.action == "downgrade":
+        downgrade()
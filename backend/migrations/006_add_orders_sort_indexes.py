@@ -0,0 +1,85 @@
+"""
+Migration: Add order sort indexes
+Version: 006
+Description: Adds (column, id) indexes for every sortable GET /orders column
+except order_number (served by idx_orders_list), so sorted pages, keyset
+seeks and date/amount range filters never need a temp B-tree sort
+"""
+
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import DATABASE_PATH
+
+
+def upgrade():
+    """Apply the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    # Create migrations tracking table if it doesn't exist
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS _migrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Check if this migration has already been applied
+    cursor.execute("SELECT 1 FROM _migrations WHERE name = ?", ("006_add_orders_sort_indexes",))
+    if cursor.fetchone():
+        print("Migration 006_add_orders_sort_indexes already applied. Skipping.")
+        conn.close()
+        return
+
+    # id breaks ties, matching the ORDER BY and keyset comparisons in get_orders
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_order_date ON orders (order_date, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_total_amount ON orders (total_amount, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_customer_name ON orders (customer_name, id)")
+
+    # Record this migration
+    cursor.execute("INSERT INTO _migrations (name) VALUES (?)", ("006_add_orders_sort_indexes",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 006_add_orders_sort_indexes applied successfully.")
+
+
+def downgrade():
+    """Revert the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute("DROP INDEX IF EXISTS idx_orders_order_date")
+    cursor.execute("DROP INDEX IF EXISTS idx_orders_total_amount")
+    cursor.execute("DROP INDEX IF EXISTS idx_orders_customer_name")
+
+    # Remove migration record
+    cursor.execute("DELETE FROM _migrations WHERE name = ?", ("006_add_orders_sort_indexes",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 006_add_orders_sort_indexes reverted successfully.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run database migration")
+    parser.add_argument(
+        "action",
+        choices=["upgrade", "downgrade"],
+        help="Migration action to perform"
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "upgrade":
+        upgrade()
+    elif args.action == "downgrade":
+        downgrade()
@@ -0,0 +1,84 @@
+"""
+Migration: Enable WAL journal mode
+Version: 007
+Description: Switches the database to write-ahead logging. Readers and
+writers no longer block each other, and an online backup can hold one read
+snapshot for its whole run without stalling writers. The mode is stored in
+the database file, so every later connection uses it: this is a
+database-wide change. Transactions that span ATTACHed files are then only
+atomic per file
+"""
+
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import DATABASE_PATH
+
+
+def upgrade():
+    """Apply the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    # Create migrations tracking table if it doesn't exist
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS _migrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Check if this migration has already been applied
+    cursor.execute("SELECT 1 FROM _migrations WHERE name = ?", ("007_enable_wal_journal",))
+    if cursor.fetchone():
+        print("Migration 007_enable_wal_journal already applied. Skipping.")
+        conn.close()
+        return
+
+    # journal_mode cannot change inside a transaction, so run it on its own
+    cursor.execute("PRAGMA journal_mode = WAL")
+
+    # Record this migration
+    cursor.execute("INSERT INTO _migrations (name) VALUES (?)", ("007_enable_wal_journal",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 007_enable_wal_journal applied successfully.")
+
+
+def downgrade():
+    """Revert the migration."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA journal_mode = DELETE")
+
+    # Remove migration record
+    cursor.execute("DELETE FROM _migrations WHERE name = ?", ("007_enable_wal_journal",))
+
+    conn.commit()
+    conn.close()
+    print("Migration 007_enable_wal_journal reverted successfully.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run database migration")
+    parser.add_argument(
+        "action",
+        choices=["upgrade", "downgrade"],
+        help="Migration action to perform"
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "upgrade":
+        upgrade()
+    elif args.action == "downgrade":
+        downgrade()